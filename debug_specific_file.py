@@ -8,12 +8,11 @@ from pathlib import Path
 # Add codesitter to path
 sys.path.insert(0, '/Users/mustafaacar/codesitter/src')
 
-from codesitter.analyzers import get_analyzer, register_defaults, auto_discover_analyzers
+from codesitter.analyzers import get_analyzer, ensure_initialized
 from codesitter.analyzers.base import CodeChunk
 
 # Initialize analyzers
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # The file path from the user's project
 file_path = sys.argv[1] if len(sys.argv) > 1 else "modules/shortlink-api/src/services/instanceService.ts"
@@ -52,7 +51,7 @@ chunk = CodeChunk(
     text=content,
     filename=file_path,
     start_line=1,
-    end_line=len(content.split('\n')),
+    end_line=content.count('\n') + 1,
     node_type="file",
     symbols=[],
     metadata={}
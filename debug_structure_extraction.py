@@ -12,7 +12,6 @@ from codesitter.analyzers.base import CodeChunk
 
 # Read test file
 content = Path("test_calls.ts").read_text()
-lines = content.split('\n')
 
 # Create analyzer and chunk
 analyzer = TypeScriptAnalyzer()
@@ -20,7 +19,7 @@ chunk = CodeChunk(
     text=content,
     filename="test_calls.ts",
     start_line=1,
-    end_line=len(lines),
+    end_line=content.count('\n') + 1,
     node_type="file",
     symbols=[]
 )
@@ -15,7 +15,6 @@ from tree_sitter_language_pack import get_language
 
 # Read test file
 content = Path("test_calls.ts").read_text()
-lines = content.split('\n')
 
 print("COMPLETE STRUCTURE EXTRACTION ANALYSIS")
 print("=" * 70)
@@ -68,7 +67,7 @@ chunk = CodeChunk(
     text=content,
     filename="test_calls.ts",
     start_line=1,
-    end_line=len(lines),
+    end_line=content.count('\n') + 1,
     node_type="file",
     symbols=[]
 )
@@ -92,12 +92,11 @@ print("\nNow testing the TypeScript analyzer...")
 import sys
 sys.path.insert(0, "/Users/mustafaacar/codesitter/src")
 
-from codesitter.analyzers import register_defaults, auto_discover_analyzers, get_analyzer
+from codesitter.analyzers import ensure_initialized, get_analyzer
 from codesitter.analyzers.base import CodeChunk
 
 # Initialize
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # Test with the test file
 test_file = "/Users/mustafaacar/codesitter/test_file.ts"
@@ -111,7 +110,7 @@ if os.path.exists(test_file):
             text=content,
             filename=test_file,
             start_line=1,
-            end_line=len(content.split('\n')),
+            end_line=content.count('\n') + 1,
             node_type="file",
             symbols=[],
             metadata={}
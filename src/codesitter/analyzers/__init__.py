@@ -9,11 +9,13 @@ from .base import (
 )
 from .registry import (
     AnalyzerRegistry,
+    file_extension,
     get_analyzer,
     get_registry,
     register_analyzer,
     auto_discover_analyzers,
-    register_defaults
+    register_defaults,
+    ensure_initialized
 )
 
 __all__ = [
@@ -23,9 +25,11 @@ __all__ = [
     'CallRelationship',
     'ImportRelationship',
     'AnalyzerRegistry',
+    'file_extension',
     'get_analyzer',
     'get_registry',
     'register_analyzer',
     'auto_discover_analyzers',
-    'register_defaults'
+    'register_defaults',
+    'ensure_initialized'
 ]
@@ -6,11 +6,11 @@ into the code indexing system.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Iterator, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeChunk:
     """Represents a chunk of code with metadata."""
     text: str
@@ -20,9 +20,12 @@ class CodeChunk:
     node_type: str
     symbols: List[str]
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # (language, text, tree) from the last parse_chunk() call, so the
+    # extract_* methods run on one chunk share a single parse
+    parsed: Optional[Tuple[Any, str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class CallRelationship:
     """Represents a function call relationship."""
     filename: str
@@ -34,7 +37,7 @@ class CallRelationship:
     context: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportRelationship:
     """Represents an import/dependency relationship."""
     filename: str
@@ -3,11 +3,11 @@
 from typing import Iterator, List, Dict, Any
 import logging
 
-from tree_sitter import Language, Parser, Query, QueryCursor
+from tree_sitter import Language, Parser, QueryCursor
 from tree_sitter_language_pack import get_language
 
 from ..base import LanguageAnalyzer, CodeChunk, CallRelationship, ImportRelationship
-from ..parser_utils import create_parser, query_captures
+from ..parser_utils import compile_query, create_parser, parse_chunk, query_captures
 
 logger = logging.getLogger(__name__)
 
@@ -109,9 +109,9 @@ class PythonAnalyzer(LanguageAnalyzer):
         parser = create_parser(self._language)
 
         try:
-            tree = parser.parse(bytes(chunk.text, "utf8"))
-            # Use language.query() instead of Query() constructor
-            query = Query(self._language, self._call_query)
+            tree = parse_chunk(parser, self._language, chunk)
+            # Compiled once per language, then reused
+            query = compile_query(self._language, self._call_query)
             captures = query_captures(query, tree.root_node)
 
             # Find containing function/method for context
@@ -189,9 +189,9 @@ class PythonAnalyzer(LanguageAnalyzer):
         parser = create_parser(self._language)
 
         try:
-            tree = parser.parse(bytes(chunk.text, "utf8"))
-            # Use language.query() instead of Query() constructor
-            query = Query(self._language, self._import_query)
+            tree = parse_chunk(parser, self._language, chunk)
+            # Compiled once per language, then reused
+            query = compile_query(self._language, self._import_query)
             captures = query_captures(query, tree.root_node)
 
             # Process imports
@@ -270,10 +270,10 @@ class PythonAnalyzer(LanguageAnalyzer):
         parser = create_parser(self._language)
 
         try:
-            tree = parser.parse(bytes(chunk.text, "utf8"))
+            tree = parse_chunk(parser, self._language, chunk)
 
             # Check for decorators
-            dec_query = Query(self._language, self._decorator_query)
+            dec_query = compile_query(self._language, self._decorator_query)
             dec_captures = dec_query.captures(tree.root_node)
 
             decorators = set()
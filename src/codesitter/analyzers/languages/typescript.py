@@ -3,11 +3,11 @@
 from typing import Iterator, List, Dict, Any
 import logging
 
-from tree_sitter import Language, Parser, Query, QueryCursor
+from tree_sitter import Language, Parser, QueryCursor
 from tree_sitter_language_pack import get_language
 
 from ..base import LanguageAnalyzer, CodeChunk, CallRelationship, ImportRelationship, ExtractedElement
-from ..parser_utils import create_parser, query_captures
+from ..parser_utils import compile_query, create_parser, parse_chunk, query_captures
 from ..universal_extractor import TypeScriptExtractor
 
 logger = logging.getLogger(__name__)
@@ -44,8 +44,13 @@ class TypeScriptAnalyzer(LanguageAnalyzer):
             ".jsx": self._jsx_language,
         }
 
-        # Initialize the universal extractor for structure extraction
-        self._ts_extractor = TypeScriptExtractor(self._ts_language)
+        # Initialize the universal extractors for structure extraction; they
+        # hold no per-parse state, so one per extension is reused
+        self._extractors = {
+            ext: TypeScriptExtractor(language)
+            for ext, language in self._language_map.items()
+        }
+        self._ts_extractor = self._extractors[".ts"]
 
         # Define queries
         self._call_query = """
@@ -129,13 +134,13 @@ class TypeScriptAnalyzer(LanguageAnalyzer):
         parser, language = self._get_parser_and_language(chunk.filename)
 
         try:
-            tree = parser.parse(bytes(chunk.text, "utf8"))
-            # Use Query() constructor instead of language.query()
-            query = Query(language, self._call_query)
+            tree = parse_chunk(parser, language, chunk)
+            # Compiled once per language, then reused
+            query = compile_query(language, self._call_query)
             captures = query_captures(query, tree.root_node)
 
             # Find containing function for context
-            func_query = Query(language, self._function_query)
+            func_query = compile_query(language, self._function_query)
             func_captures = query_captures(func_query, tree.root_node)
 
             # Build a map of byte ranges to function names
@@ -200,9 +205,9 @@ class TypeScriptAnalyzer(LanguageAnalyzer):
         parser, language = self._get_parser_and_language(chunk.filename)
 
         try:
-            tree = parser.parse(bytes(chunk.text, "utf8"))
-            # Use Query() constructor instead of language.query()
-            query = Query(language, self._import_query)
+            tree = parse_chunk(parser, language, chunk)
+            # Compiled once per language, then reused
+            query = compile_query(language, self._import_query)
             captures = query_captures(query, tree.root_node)
 
             # Group captures by import statement
@@ -311,18 +316,14 @@ class TypeScriptAnalyzer(LanguageAnalyzer):
 
         try:
             # Parse the code
-            tree = parser.parse(bytes(chunk.text, "utf8"))
+            tree = parse_chunk(parser, language, chunk)
 
             # Use the appropriate extractor based on file extension
             import os
             ext = os.path.splitext(chunk.filename)[1].lower()
 
-            # Create the appropriate extractor for this file type
-            if ext in self._language_map:
-                extractor = TypeScriptExtractor(self._language_map[ext])
-            else:
-                # Default to TypeScript
-                extractor = self._ts_extractor
+            # Use the appropriate extractor for this file type, defaulting to TypeScript
+            extractor = self._extractors.get(ext, self._ts_extractor)
 
             # Extract all structural elements
             for element in extractor.extract_all(tree):
@@ -3,9 +3,11 @@ Utility functions for tree-sitter parser creation.
 Handles API differences between tree-sitter versions.
 """
 
-from tree_sitter import Parser, Language, Query, QueryCursor
+import functools
 import logging
 
+from tree_sitter import Language, Parser, Query, QueryCursor, Tree
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +48,35 @@ def create_parser(language: Language) -> Parser:
     )
 
 
+def parse_chunk(parser: Parser, language: Language, chunk) -> Tree:
+    """
+    Parse a CodeChunk's text, reusing the tree from an earlier call.
+
+    The tree is kept on the chunk and reused while the chunk's text and the
+    language are unchanged, so analyzing one chunk for calls, imports and
+    structure parses it once.
+    """
+    cached = chunk.parsed
+    if cached is not None and cached[0] is language and cached[1] is chunk.text:
+        return cached[2]
+
+    tree = parser.parse(bytes(chunk.text, "utf8"))
+    chunk.parsed = (language, chunk.text, tree)
+    return tree
+
+
+@functools.cache
+def compile_query(language: Language, source: str) -> Query:
+    """
+    Compile a query once per (language, source) and reuse it.
+
+    Compiling an analyzer query takes milliseconds and the analyzers run the
+    same few queries on every chunk. Compiled queries are immutable and safe to
+    share; each execution gets its own QueryCursor.
+    """
+    return Query(language, source)
+
+
 def query_captures(query: Query, node, start_byte=None, end_byte=None):
     """
     Get captures from a query using the correct API.
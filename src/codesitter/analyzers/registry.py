@@ -4,7 +4,6 @@ Analyzer Registry
 Manages registration and lookup of language-specific analyzers.
 """
 
-import os
 import importlib
 import logging
 from typing import Dict, Optional, Type, List
@@ -15,12 +14,29 @@ from .base import LanguageAnalyzer, DefaultAnalyzer
 logger = logging.getLogger(__name__)
 
 
+def file_extension(filename: str) -> str:
+    """
+    Lowercased extension of a path, matching os.path.splitext(filename)[1].lower().
+
+    Slices the basename directly instead of going through splitext, since this
+    runs for every file and chunk the flows process.
+    """
+    base = filename[filename.rfind('/') + 1:]
+    dot = base.rfind('.')
+    # Leading dots mark a hidden file, not an extension
+    if dot > 0 and base[:dot].lstrip('.'):
+        return base[dot:].lower()
+    return ''
+
+
 class AnalyzerRegistry:
     """Registry for language analyzers."""
 
     def __init__(self):
         self._analyzers: Dict[str, LanguageAnalyzer] = {}
         self._extension_map: Dict[str, str] = {}
+        # Extension -> analyzer (or None), filled lazily and reset on register
+        self._analyzer_cache: Dict[str, Optional[LanguageAnalyzer]] = {}
 
     def register(self, analyzer: LanguageAnalyzer) -> None:
         """
@@ -37,6 +53,7 @@ class AnalyzerRegistry:
                 logger.debug(f"Replacing {type(self._analyzers[language]).__name__} with {type(analyzer).__name__} for {language}")
 
         self._analyzers[language] = analyzer
+        self._analyzer_cache.clear()
 
         # Map extensions to language
         for ext in analyzer.supported_extensions:
@@ -52,13 +69,16 @@ class AnalyzerRegistry:
         Returns:
             The analyzer instance or None if no analyzer found
         """
-        ext = os.path.splitext(filename)[1].lower()
-        language = self._extension_map.get(ext)
+        ext = file_extension(filename)
+        try:
+            return self._analyzer_cache[ext]
+        except KeyError:
+            pass
 
-        if language:
-            return self._analyzers.get(language)
-
-        return None
+        language = self._extension_map.get(ext)
+        analyzer = self._analyzers.get(language) if language else None
+        self._analyzer_cache[ext] = analyzer
+        return analyzer
 
     def get_analyzer_by_language(self, language: str) -> Optional[LanguageAnalyzer]:
         """Get analyzer by language name."""
@@ -186,3 +206,22 @@ def register_defaults():
         # Skip if this language likely has a custom analyzer
         if analyzer.language_name not in skip_languages:
             register_analyzer(analyzer)
+
+
+_initialized = False
+
+
+def ensure_initialized() -> None:
+    """
+    Register the default analyzers and auto-discover the language analyzers.
+
+    Safe to call from every module that needs a populated registry; the work
+    is done only on the first call in a process.
+    """
+    global _initialized
+    if _initialized:
+        return
+    logger.info("Initializing language analyzers...")
+    register_defaults()
+    auto_discover_analyzers()
+    _initialized = True
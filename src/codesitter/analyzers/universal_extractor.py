@@ -63,13 +63,24 @@ class UniversalExtractor(ABC):
         # and marked as exported via metadata
     }
 
+    # Reverse mapping (node type -> element type) per extractor class
+    _element_maps: Dict[type, Dict[str, str]] = {}
+
     def __init__(self, language):
         self.language = language
-        # Build reverse mapping for quick lookup
-        self._node_type_to_element = {}
+        # Reverse mapping for quick lookup, built once per class and shared
+        cls = type(self)
+        if cls not in UniversalExtractor._element_maps:
+            UniversalExtractor._element_maps[cls] = self._build_element_map()
+        self._node_type_to_element = UniversalExtractor._element_maps[cls]
+
+    def _build_element_map(self) -> Dict[str, str]:
+        """Map each node type in the patterns to its element type."""
+        element_map = {}
         for element_type, patterns in self.UNIVERSAL_PATTERNS.items():
             for pattern in patterns:
-                self._node_type_to_element[pattern] = element_type
+                element_map[pattern] = element_type
+        return element_map
 
     def extract_all(self, tree) -> Iterator[ExtractedElement]:
         """Extract all structural elements from the tree."""
@@ -204,21 +215,29 @@ class TypeScriptExtractor(UniversalExtractor):
         'namespace': ['namespace_declaration', 'module_declaration'],
     }
 
-    def __init__(self, language):
-        super().__init__(language)
+    def _build_element_map(self) -> Dict[str, str]:
+        element_map = super()._build_element_map()
         # Add TypeScript-specific patterns
         for element_type, patterns in self.TS_PATTERNS.items():
             for pattern in patterns:
-                self._node_type_to_element[pattern] = element_type
+                element_map[pattern] = element_type
+        return element_map
 
     def _check_export_status(self, element: ExtractedElement, node):
         """Check if the element is exported (the only thing that requires AST analysis)."""
+        export = None
         parent = node.parent
         if parent:
             if parent.type == 'export_statement':
-                element.metadata['exported'] = True
+                export = parent
             elif parent.parent and parent.parent.type == 'export_statement':
-                element.metadata['exported'] = True
+                export = parent.parent
+
+        if export:
+            element.metadata['exported'] = True
+            # `export default ...` has an anonymous `default` keyword child
+            if any(child.type == 'default' for child in export.children):
+                element.metadata['default_export'] = True
 
     def _enrich_element(self, element: ExtractedElement, node):
         """Add TypeScript-specific metadata - simplified to only export status."""
@@ -91,7 +91,7 @@ class SmartChunker:
             text=content,
             filename=file_path,
             start_line=1,
-            end_line=len(content.split('\n')),
+            end_line=content.count('\n') + 1,
             node_type="file",
             symbols=[],  # Will be populated by analysis
             metadata={"language": analyzer.language_name}
@@ -129,16 +129,17 @@ class SmartChunker:
 
         # For now, use simple extraction for functions and classes
         # This could be enhanced with AST parsing per language
-        result['functions'] = self._extract_functions_simple(content)
-        result['classes'] = self._extract_classes_simple(content)
+        # Split once; both scans walk the same lines
+        lines = content.split('\n')
+        result['functions'] = self._extract_functions_simple(lines)
+        result['classes'] = self._extract_classes_simple(lines)
         result['exports'] = self._extract_exports_simple(content)
 
         return result
 
-    def _extract_functions_simple(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_functions_simple(self, lines: List[str]) -> List[Dict[str, Any]]:
         """Simple function extraction based on common patterns."""
         functions = []
-        lines = content.split('\n')
 
         function_patterns = [
             (r'^\s*(?:export\s+)?(?:async\s+)?function\s+(\w+)', 'function'),
@@ -170,10 +171,9 @@ class SmartChunker:
 
         return functions
 
-    def _extract_classes_simple(self, content: str) -> List[Dict[str, Any]]:
+    def _extract_classes_simple(self, lines: List[str]) -> List[Dict[str, Any]]:
         """Simple class extraction."""
         classes = []
-        lines = content.split('\n')
 
         import re
         class_pattern = r'^\s*(?:export\s+)?class\s+(\w+)'
@@ -1,6 +1,5 @@
 """codesitter CLI Interface."""
 
-import os
 from pathlib import Path
 from dotenv import load_dotenv
 
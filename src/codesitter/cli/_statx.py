@@ -0,0 +1,82 @@
+"""
+Size-only file stat for Linux.
+
+Uses statx(2) through ctypes so that only STATX_SIZE is requested and
+network/FUSE filesystems are not forced to sync attributes. Falls back to
+os.stat() on other platforms, old glibc, or kernels without statx.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import functools
+import os
+import sys
+
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_SIZE = 0x200
+
+
+class _Statx(ctypes.Structure):
+    """struct statx from <linux/stat.h> (256 bytes)."""
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32),
+        ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32),
+        ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16),
+        ("__spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64),
+        ("stx_size", ctypes.c_uint64),
+        ("__rest", ctypes.c_uint8 * 208),
+    ]
+
+
+@functools.cache
+def _libc_statx():
+    """Return the bound libc statx function, or None if unavailable."""
+    if sys.platform != "linux":
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        statx = libc.statx
+    except (OSError, AttributeError):
+        return None
+
+    statx.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_uint,
+        ctypes.POINTER(_Statx),
+    ]
+    statx.restype = ctypes.c_int
+    return statx
+
+
+_statx_supported = True
+
+
+def fast_size(path: str) -> int:
+    """Return the size of the file at ``path`` in bytes."""
+    global _statx_supported
+
+    statx = _libc_statx() if _statx_supported else None
+    if statx is None:
+        return os.stat(path).st_size
+
+    buf = _Statx()
+    if statx(AT_FDCWD, os.fsencode(path), AT_STATX_DONT_SYNC, STATX_SIZE, ctypes.byref(buf)) == 0:
+        return buf.stx_size
+
+    err = ctypes.get_errno()
+    if err == errno.ENOSYS:
+        # Kernel older than 4.11; stop trying
+        _statx_supported = False
+        return os.stat(path).st_size
+
+    raise OSError(err, os.strerror(err), path)
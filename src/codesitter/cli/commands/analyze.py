@@ -3,38 +3,36 @@
 import click
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Dict, Any
 from rich.console import Console
 from rich.table import Table
-from rich.syntax import Syntax
 
-from ...analyzers import get_analyzer, get_registry, auto_discover_analyzers, register_defaults
+from ...analyzers import get_analyzer, get_registry, ensure_initialized
 from ...analyzers.base import CodeChunk
 
 console = Console()
 
-# Initialize analyzer registry once at module load
-_initialized = False
-
-def _ensure_initialized():
-    """Ensure analyzers are initialized only once."""
-    global _initialized
-    if not _initialized:
-        register_defaults()
-        auto_discover_analyzers()
-        _initialized = True
-
+# Icon for each structure element type
+ELEMENT_ICONS = {
+    'function': '🔧',
+    'class': '🏛️',
+    'interface': '📘',
+    'type': '📐',
+    'enum': '🎯',
+    'variable': '📦'
+}
+DEFAULT_ICON = '📄'
 
 @click.group()
 def analyze():
     """Run analyzers standalone without indexing."""
-    _ensure_initialized()
+    ensure_initialized()
 
 
-@analyze.command()
-def list():
+@analyze.command(name='list')
+def list_analyzers():
     """List all available analyzers and their capabilities."""
-    _ensure_initialized()
+    ensure_initialized()
     registry = get_registry()
 
     table = Table(title="Available Analyzers")
@@ -86,7 +84,7 @@ def list():
 @click.option('--json', 'output_json', is_flag=True, help='Output as JSON')
 def file(file_path: str, output_json: bool):
     """Analyze a single file."""
-    _ensure_initialized()
+    ensure_initialized()
     path = Path(file_path)
 
     with open(path, 'r') as f:
@@ -135,7 +133,7 @@ def file(file_path: str, output_json: bool):
         ]
     except Exception as e:
         if output_json:
-            result["errors"] = {"calls": str(e)}
+            result.setdefault("errors", {})["calls"] = str(e)
 
     try:
         result["imports"] = [
@@ -150,15 +148,13 @@ def file(file_path: str, output_json: bool):
         ]
     except Exception as e:
         if output_json:
-            result["errors"] = result.get("errors", {})
-            result["errors"]["imports"] = str(e)
+            result.setdefault("errors", {})["imports"] = str(e)
 
     try:
         result["metadata"] = analyzer.extract_custom_metadata(chunk)
     except Exception as e:
         if output_json:
-            result["errors"] = result.get("errors", {})
-            result["errors"]["metadata"] = str(e)
+            result.setdefault("errors", {})["metadata"] = str(e)
 
     try:
         result["structure"] = [
@@ -167,12 +163,11 @@ def file(file_path: str, output_json: bool):
         ]
     except Exception as e:
         if output_json:
-            result["errors"] = result.get("errors", {})
-            result["errors"]["structure"] = str(e)
+            result.setdefault("errors", {})["structure"] = str(e)
 
     # Output results
     if output_json:
-        console.print(json.dumps(result, indent=2))
+        console.out(json.dumps(result, indent=2))
     else:
         _pretty_print_analysis(result)
 
@@ -198,16 +193,16 @@ def _element_to_dict(elem, lines):
 @click.argument('directory', type=click.Path(exists=True, file_okay=False))
 @click.option('--ext', help='File extension filter (e.g., .ts)')
 @click.option('--json', 'output_json', is_flag=True, help='Output as JSON')
-def directory(directory: str, ext: str, output_json: bool):
+@click.option('--ndjson', 'output_ndjson', is_flag=True,
+              help='Stream one JSON record per file, followed by a summary record')
+def directory(directory: str, ext: str, output_json: bool, output_ndjson: bool):
     """Analyze all files in a directory."""
-    _ensure_initialized()
+    ensure_initialized()
     path = Path(directory)
     registry = get_registry()
 
-    # Get supported extensions
-    supported_exts = set()
-    for exts in registry.list_supported_extensions().keys():
-        supported_exts.add(exts)
+    # Get supported extensions, longest first so compound suffixes win
+    supported_exts = tuple(sorted(registry.list_supported_extensions(), key=len, reverse=True))
 
     # Find files
     if ext:
@@ -215,13 +210,14 @@ def directory(directory: str, ext: str, output_json: bool):
     else:
         pattern = "*"
 
-    files = [f for f in path.rglob(pattern) if f.suffix in supported_exts]
+    files = [f for f in path.rglob(pattern) if f.name.endswith(supported_exts)]
 
     if not files:
         console.print(f"[yellow]No analyzable files found in {directory}[/yellow]")
         return
 
-    console.print(f"[blue]Found {len(files)} files to analyze[/blue]")
+    if not output_ndjson:
+        console.print(f"[blue]Found {len(files)} files to analyze[/blue]")
 
     stats = {
         "total_files": len(files),
@@ -231,53 +227,67 @@ def directory(directory: str, ext: str, output_json: bool):
         "files": []
     }
 
+    # Analyzers only read the chunk while their results are consumed below and
+    # never keep a reference to it, so one instance is reused for every file.
+    chunk = CodeChunk(
+        text="",
+        filename="",
+        start_line=1,
+        end_line=0,
+        node_type="file",
+        symbols=[]  # Empty list for now
+    )
+
     with console.status("[bold green]Analyzing files...") as status:
         for i, file_path in enumerate(files):
+            # Resolve the path string once and reuse it for every lookup below
+            path_str = str(file_path)
             status.update(f"[bold green]Analyzing {i+1}/{len(files)}: {file_path.name}")
 
             try:
-                with open(file_path, 'r') as f:
+                with open(path_str, 'r') as f:
                     content = f.read()
 
-                analyzer = get_analyzer(str(file_path))
+                analyzer = get_analyzer(path_str)
                 if not analyzer:
                     continue
 
-                chunk = CodeChunk(
-                    text=content,
-                    filename=str(file_path),
-                    start_line=1,
-                    end_line=len(content.split('\n')),
-                    node_type="file",
-                    symbols=[]  # Empty list for now
-                )
+                chunk.text = content
+                chunk.filename = path_str
+                chunk.end_line = content.count('\n') + 1
 
                 # Count items
-                imports = list(analyzer.extract_import_relationships(chunk))
-                calls = list(analyzer.extract_call_relationships(chunk))
+                import_count = sum(1 for _ in analyzer.extract_import_relationships(chunk))
+                call_count = sum(1 for _ in analyzer.extract_call_relationships(chunk))
 
                 lang = analyzer.language_name
                 stats["by_language"][lang] = stats["by_language"].get(lang, 0) + 1
-                stats["total_imports"] += len(imports)
-                stats["total_calls"] += len(calls)
-
-                if output_json:
-                    stats["files"].append({
-                        "file": str(file_path),
-                        "language": lang,
-                        "imports": len(imports),
-                        "calls": len(calls)
-                    })
+                stats["total_imports"] += import_count
+                stats["total_calls"] += call_count
+
+                record = {
+                    "file": path_str,
+                    "language": lang,
+                    "imports": import_count,
+                    "calls": call_count
+                }
 
             except Exception as e:
-                if output_json:
-                    stats["files"].append({
-                        "file": str(file_path),
-                        "error": str(e)
-                    })
+                record = {
+                    "file": path_str,
+                    "error": str(e)
+                }
 
-    if output_json:
-        console.print(json.dumps(stats, indent=2))
+            if output_ndjson:
+                console.out(json.dumps(record))
+            elif output_json:
+                stats["files"].append(record)
+
+    if output_ndjson:
+        del stats["files"]
+        console.out(json.dumps({"summary": stats}))
+    elif output_json:
+        console.out(json.dumps(stats, indent=2))
     else:
         _print_directory_stats(stats)
 
@@ -317,14 +327,7 @@ def _pretty_print_analysis(result: Dict[str, Any]):
         console.print(f"\n[bold magenta]🏗️  Structure ({len(result['structure'])} elements):[/bold magenta]")
         for elem in result['structure']:
             # Icon based on type
-            icon = {
-                'function': '🔧',
-                'class': '🏛️',
-                'interface': '📘',
-                'type': '📐',
-                'enum': '🎯',
-                'variable': '📦'
-            }.get(elem['type'], '📄')
+            icon = ELEMENT_ICONS.get(elem['type'], DEFAULT_ICON)
 
             console.print(f"  {icon} {elem['type'].capitalize()}: [bold]{elem['name']}[/bold] (lines {elem['lines']})")
 
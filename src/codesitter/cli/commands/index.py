@@ -1,81 +1,170 @@
 """Index command for codesitter CLI."""
 
-import click
+import heapq
 import os
-import sys
+import queue
+import re
 import subprocess
-import json
+import sys
+import threading
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+import click
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.panel import Panel
 from rich.table import Table
 
-from ..config import BASIC_FLOW_PATH, ENHANCED_FLOW_PATH, FLEXIBLE_FLOW_PATH, FLEXIBLE_NO_VECTOR_FLOW_PATH, SIMPLE_FLOW_PATH, MINIMAL_FLEXIBLE_FLOW_PATH, MINIMAL_FLOW_PATH, ANALYZER_AWARE_FLOW_PATH, ANALYZER_ADVANCED_FLOW_PATH, ANALYZER_SIMPLE_FLOW_PATH, ANALYZER_DETAILED_FLOW_PATH, SMART_CHUNKING_FLOW_PATH
+from .._statx import fast_size
+from ..config import DEFERRED_INDEX_FLOWS, FLOW_MAP
 
 console = Console()
 
-
-def discover_files(target_path: Path, verbose: bool = False):
-    """Discover files that will be processed by the flow."""
-    console.print("[blue]Scanning for files to index...[/blue]")
-
-    # Common file extensions that will be processed
-    supported_extensions = {
-        '.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs',  # JavaScript/TypeScript
-        '.py', '.pyw',  # Python
-        '.html', '.htm',  # HTML
-        '.css', '.scss', '.sass',  # CSS
-        '.json', '.yaml', '.yml', '.toml',  # Config files
-        '.xml', '.sh', '.bash',  # Other
-        '.c', '.cpp', '.cc', '.cxx',  # C/C++
-        '.rs', '.go', '.rb', '.php', '.swift', '.kt', '.java'  # Other languages
-    }
-
-    files_to_process = []
+# Common file extensions that will be processed
+SUPPORTED_EXTENSIONS = frozenset({
+    '.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs',  # JavaScript/TypeScript
+    '.py', '.pyw',  # Python
+    '.html', '.htm',  # HTML
+    '.css', '.scss', '.sass',  # CSS
+    '.json', '.yaml', '.yml', '.toml',  # Config files
+    '.xml', '.sh', '.bash',  # Other
+    '.c', '.cpp', '.cc', '.cxx',  # C/C++
+    '.rs', '.go', '.rb', '.php', '.swift', '.kt', '.java'  # Other languages
+})
+
+# Directory names that are never descended into
+IGNORE_DIRS = frozenset({
+    'node_modules', '.git', 'dist', 'build', '.venv', 'venv', 'cdk.out',
+    '__pycache__', '.pytest_cache', '.coverage'
+})
+
+# Candidate file name in a cocoindex log line; the extension is validated
+# against SUPPORTED_EXTENSIONS after matching. The boundary is a lookahead so
+# finditer() also sees a name right after a dotted directory.
+_FILENAME_RE = re.compile(r'[\\/]([^\\/]+\.[A-Za-z0-9]{1,5})(?=\W|$)')
+
+
+def _progress_filename(line: str) -> str:
+    """First path component in a log line with a supported extension, else "unknown"."""
+    for match in _FILENAME_RE.finditer(line):
+        candidate = match.group(1)
+        if candidate[candidate.rfind('.'):].lower() in SUPPORTED_EXTENSIONS:
+            return candidate
+    return "unknown"
+
+
+# Minimum interval between console flushes in verbose indexing (50ms)
+OUTPUT_FLUSH_NS = 50_000_000
+
+# Classifies a cocoindex log line in a single match. Alternatives are tried in
+# priority order (progress keywords first, "file" ahead of the rest so the
+# filename lookup can be skipped otherwise), and the lookaheads let a keyword
+# appear anywhere in the line. Dispatch on match.lastgroup.
+_LINE_CLASSIFIER = re.compile(
+    r'(?=.*?file)(?P<file>)'
+    r'|(?=.*?(?:processing|found|indexing|chunk))(?P<progress>)'
+    r'|(?=.*?error)(?P<error>)'
+    r'|(?=.*?warning)(?P<warning>)'
+    r'|(?=.*?(?:setup|database))(?P<setup>)'
+    r'|(?=.*?(?:create|table))(?P<db>)',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _scan_directory(dir_path: str, files: list):
+    """
+    Scan a single directory level.
+
+    Supported files are appended to ``files``. Returns the subdirectories that
+    should be descended into and the total size of the files added.
+    """
+    subdirs = []
     total_size = 0
 
-    for ext in supported_extensions:
-        for file_path in target_path.rglob(f"*{ext}"):
-            # Skip common directories to ignore
-            if any(ignore in str(file_path) for ignore in [
-                'node_modules', '.git', 'dist', 'build', '.venv', 'venv', 'cdk.out',
-                '__pycache__', '.pytest_cache', '.coverage'
-            ]):
-                continue
-
-            try:
-                file_size = file_path.stat().st_size
-                files_to_process.append({
-                    'path': file_path,
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORE_DIRS:
+                            subdirs.append(entry.path)
+                        continue
+
+                    # Filter on the name alone; only accepted files are stat'ed
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot <= 0:
+                        continue
+                    ext = name[dot:]
+                    if ext not in SUPPORTED_EXTENSIONS or not entry.is_file():
+                        continue
+
+                    file_size = fast_size(entry.path)
+                except (OSError, PermissionError):
+                    continue
+
+                files.append({
+                    'path': Path(entry.path),
                     'size': file_size,
                     'ext': ext
                 })
                 total_size += file_size
-            except (OSError, PermissionError):
-                continue
+    except (OSError, PermissionError):
+        pass
+
+    return subdirs, total_size
+
+
+def _scan_tree(root: str):
+    """Walk ``root`` depth-first and return (files, total_size)."""
+    files = []
+    total_size = 0
+
+    stack = [root]
+    while stack:
+        subdirs, size = _scan_directory(stack.pop(), files)
+        stack.extend(subdirs)
+        total_size += size
+
+    return files, total_size
 
-    # Sort by size (largest first) for better progress indication
-    files_to_process.sort(key=lambda x: x['size'], reverse=True)
+
+def discover_files(target_path: Path, verbose: bool = False):
+    """Discover files that will be processed by the flow."""
+    console.print("[blue]Scanning for files to index...[/blue]")
+
+    files_to_process = []
+    subdirs, total_size = _scan_directory(str(target_path), files_to_process)
+
+    # Walk each top-level subtree on its own thread; scandir and statx are
+    # syscall-bound and release the GIL, so the walks overlap
+    if subdirs:
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(subdirs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for files, size in executor.map(_scan_tree, subdirs):
+                files_to_process.extend(files)
+                total_size += size
 
     if verbose:
         console.print(f"[green]Found {len(files_to_process)} files to process[/green]")
 
-        # Show file breakdown by extension
-        ext_counts = {}
+        # Show file breakdown by extension; count and size in one pass
+        ext_totals = {}
         for file_info in files_to_process:
-            ext = file_info['ext']
-            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+            totals = ext_totals.get(file_info['ext'])
+            if totals is None:
+                totals = ext_totals[file_info['ext']] = [0, 0]
+            totals[0] += 1
+            totals[1] += file_info['size']
 
         ext_table = Table(title="Files by Extension")
         ext_table.add_column("Extension", style="cyan")
         ext_table.add_column("Count", style="magenta")
         ext_table.add_column("Total Size", style="green")
 
-        for ext, count in sorted(ext_counts.items()):
-            ext_size = sum(f['size'] for f in files_to_process if f['ext'] == ext)
+        for ext, (count, ext_size) in sorted(ext_totals.items()):
             ext_table.add_row(ext, str(count), f"{ext_size / 1024:.1f} KB")
 
         console.print(ext_table)
@@ -83,14 +172,74 @@ def discover_files(target_path: Path, verbose: bool = False):
         # Show largest files
         if files_to_process:
             console.print(f"[blue]Largest files to process:[/blue]")
-            for i, file_info in enumerate(files_to_process[:5]):
-                rel_path = file_info['path'].relative_to(target_path)
+            # Callers only need the count, so pick the top five instead of sorting
+            largest = heapq.nlargest(5, files_to_process, key=lambda x: x['size'])
+            # Scanned paths all start with the target path string, so slice it off
+            base_len = len(os.path.join(str(target_path), ''))
+            for i, file_info in enumerate(largest):
+                rel_path = str(file_info['path'])[base_len:]
                 size_kb = file_info['size'] / 1024
                 console.print(f"  {i+1}. {rel_path} ({size_kb:.1f} KB)")
 
     return files_to_process, total_size
 
 
+def _with_settings(db_url: str, **settings: str) -> str:
+    """Database URL with ``-c name=value`` server settings added to its options."""
+    parts = urlsplit(db_url)
+    query = dict(parse_qsl(parts.query))
+    options = query.get("options", "")
+    for name, value in settings.items():
+        if name not in options:
+            options = f"{options} -c {name}={value}".strip()
+    query["options"] = options
+    # %20 rather than "+" for spaces: libpq does not form-decode URIs
+    return urlunsplit(parts._replace(query=urlencode(query, quote_via=quote)))
+
+
+def bulk_load_url(db_url: str) -> str:
+    """
+    Database URL for a one-shot bulk load, with synchronous_commit turned off.
+
+    Commits no longer wait for the WAL flush. A crash can lose the last few
+    transactions, which only means re-running the load.
+    """
+    return _with_settings(db_url, synchronous_commit="off")
+
+
+def build_vector_index(flow_path: Path, cwd: Path):
+    """
+    Create the vector indexes a deferred load left out, or exit with status 1.
+
+    Runs `cocoindex setup` with the indexes declared again, so cocoindex
+    builds them in one pass under its own names and keeps managing them on
+    later runs. The session gets more maintenance memory and parallel workers
+    for the build.
+    """
+    env = os.environ.copy()
+    env.pop('CODESITTER_DEFER_VECTOR_INDEX', None)
+    env['COCOINDEX_DATABASE_URL'] = _with_settings(
+        env['COCOINDEX_DATABASE_URL'],
+        maintenance_work_mem="2GB",
+        max_parallel_maintenance_workers="4",
+    )
+    console.print("[blue]Building vector index...[/blue]")
+
+    result = subprocess.run(
+        ["cocoindex", "setup", "--force", str(flow_path)],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        console.print(f"[red]✗ Failed to build vector index:[/red]\n{result.stderr}")
+        sys.exit(1)
+
+    console.print("[green]✓ Vector index ready[/green]")
+
+
 @click.command()
 @click.option('--path', '-p', default='.', help='Path to codebase to index')
 @click.option('--watch', '-w', is_flag=True, help='Watch for file changes')
@@ -103,7 +252,8 @@ def discover_files(target_path: Path, verbose: bool = False):
               type=click.Choice(['basic', 'simple', 'enhanced', 'flexible', 'flexible_no_vector', 'minimal_flexible', 'minimal', 'analyzer_aware', 'analyzer_advanced', 'analyzer_simple', 'analyzer_detailed', 'smart_chunking']),
               default='simple',
               help='Which flow to use for indexing')
-def index(path: str, watch: bool, postgres: bool, verbose: bool, timeout: int, json_only: bool, max_files: int, flow: str):
+@click.option('--defer-vector-index', is_flag=True, help='Bulk load: commit without waiting for WAL flushes and build the HNSW vector index after loading instead of during (analyzer_aware/analyzer_detailed with --postgres)')
+def index(path: str, watch: bool, postgres: bool, verbose: bool, timeout: int, json_only: bool, max_files: int, flow: str, defer_vector_index: bool):
     """Index a codebase with pluggable language analyzers."""
     path = Path(path).resolve()
 
@@ -127,16 +277,8 @@ def index(path: str, watch: bool, postgres: bool, verbose: bool, timeout: int, j
         try:
             from json_basic import index_to_json_basic
 
-            # Change to target directory
-            original_dir = os.getcwd()
-            os.chdir(path)
-
-            try:
-                console.print(f"[green]✓ Basic JSON indexing completed successfully![/green]")
-                console.print(f"[blue]Output file: code_index.json[/blue]")
-
-            finally:
-                os.chdir(original_dir)
+            console.print(f"[green]✓ Basic JSON indexing completed successfully![/green]")
+            console.print(f"[blue]Output file: code_index.json[/blue]")
 
         except ImportError as e:
             console.print(f"[red]Error importing JSON direct indexing: {e}[/red]")
@@ -145,21 +287,7 @@ def index(path: str, watch: bool, postgres: bool, verbose: bool, timeout: int, j
         return
 
     # Select the appropriate flow
-    flow_map = {
-        'basic': BASIC_FLOW_PATH,
-        'simple': SIMPLE_FLOW_PATH,
-        'enhanced': ENHANCED_FLOW_PATH,
-        'flexible': FLEXIBLE_FLOW_PATH,
-        'flexible_no_vector': FLEXIBLE_NO_VECTOR_FLOW_PATH,
-        'minimal_flexible': MINIMAL_FLEXIBLE_FLOW_PATH,
-        'minimal': MINIMAL_FLOW_PATH,
-        'analyzer_aware': ANALYZER_AWARE_FLOW_PATH,
-        'analyzer_advanced': ANALYZER_ADVANCED_FLOW_PATH,
-        'analyzer_simple': ANALYZER_SIMPLE_FLOW_PATH,
-        'analyzer_detailed': ANALYZER_DETAILED_FLOW_PATH,
-        'smart_chunking': SMART_CHUNKING_FLOW_PATH
-    }
-    flow_path = flow_map[flow]
+    flow_path = FLOW_MAP[flow]
 
     console.print(Panel(
         f"[bold blue]Indexing codebase at:[/bold blue] {path}\n"
@@ -185,156 +313,218 @@ def index(path: str, watch: bool, postgres: bool, verbose: bool, timeout: int, j
         if not os.getenv('DATABASE_URL'):
             console.print("[yellow]Warning: DATABASE_URL not set. Using default localhost[/yellow]")
 
-    # Change to target directory
-    original_dir = os.getcwd()
-    os.chdir(path)
-
-    try:
-        if watch:
-            # Watch mode - run server
-            console.print("[green]Starting file watcher...[/green]")
-            cmd = ["cocoindex", "server", str(flow_path)]
-            console.print(f"[blue]Running: {' '.join(cmd)}[/blue]")
-            subprocess.run(cmd)
+    # Only a one-shot Postgres load of a flow in DEFERRED_INDEX_FLOWS can defer its index
+    deferring_index = False
+    if defer_vector_index:
+        if postgres and not watch and flow in DEFERRED_INDEX_FLOWS:
+            deferring_index = True
+            os.environ['CODESITTER_DEFER_VECTOR_INDEX'] = 'true'
+            os.environ['COCOINDEX_DATABASE_URL'] = bulk_load_url(os.environ['COCOINDEX_DATABASE_URL'])
         else:
-            # Index mode with detailed progress
-            console.print("[blue]Starting indexing process...[/blue]")
-            cmd = ["cocoindex", "update", "--setup", str(flow_path)]
-
-            console.print(f"[blue]Executing: {' '.join(cmd)}[/blue]")
-            console.print(f"[yellow]Will process {len(files_to_process)} files ({total_size / 1024 / 1024:.1f} MB total)[/yellow]")
-            console.print(f"[yellow]Timeout set to {timeout} seconds[/yellow]")
-
-            # Run with real-time output for verbose mode
-            if verbose:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
-                )
-
-                # Real-time output with progress tracking
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TaskProgressColumn(),
-                    console=console
-                ) as progress:
-                    task = progress.add_task("Indexing files...", total=len(files_to_process) if files_to_process else None)
-
-                    # Track file processing
-                    files_processed = 0
-                    start_time = time.time()
-                    last_update_time = start_time
-                    last_output_time = start_time
-
-                    # Timeout tracking
-                    timeout_reached = False
-
-                    for line in process.stdout:
-                        line = line.strip()
-                        current_time = time.time()
-
-                        # Check for timeout
-                        if current_time - start_time > timeout:
-                            console.print(f"[red]⚠ TIMEOUT: Process exceeded {timeout}s timeout[/red]")
-                            timeout_reached = True
-                            process.terminate()
+            console.print("[yellow]Warning: --defer-vector-index needs --postgres, no --watch, and an analyzer_aware/analyzer_detailed flow; ignoring[/yellow]")
+
+    # cocoindex runs from the target directory; pass it as cwd rather than
+    # changing this process's working directory
+    if watch:
+        # Watch mode - run server
+        console.print("[green]Starting file watcher...[/green]")
+        cmd = ["cocoindex", "server", str(flow_path)]
+        console.print(f"[blue]Running: {' '.join(cmd)}[/blue]")
+        subprocess.run(cmd, cwd=path)
+    else:
+        # rich.progress (and rich.live under it) is only needed here; keep it off
+        # the import path of every other command
+        from rich.progress import (
+            BarColumn,
+            Progress,
+            SpinnerColumn,
+            TaskProgressColumn,
+            TextColumn,
+        )
+
+        # Index mode with detailed progress
+        console.print("[blue]Starting indexing process...[/blue]")
+        cmd = ["cocoindex", "update", "--setup", str(flow_path)]
+
+        console.print(f"[blue]Executing: {' '.join(cmd)}[/blue]")
+        console.print(f"[yellow]Will process {len(files_to_process)} files ({total_size / 1024 / 1024:.1f} MB total)[/yellow]")
+        console.print(f"[yellow]Timeout set to {timeout} seconds[/yellow]")
+
+        # Run with real-time output for verbose mode
+        if verbose:
+            process = subprocess.Popen(
+                cmd,
+                cwd=path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                universal_newlines=True
+            )
+
+            # Drain the pipe on a separate thread so cocoindex never blocks on a
+            # full stdout buffer while progress is being rendered
+            output_lines = queue.SimpleQueue()
+
+            def _read_output():
+                for raw_line in process.stdout:
+                    output_lines.put(raw_line)
+                output_lines.put(None)
+
+            threading.Thread(target=_read_output, daemon=True).start()
+
+            # Real-time output with progress tracking
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                console=console
+            ) as progress:
+                task = progress.add_task("Indexing files...", total=len(files_to_process) if files_to_process else None)
+
+                # Track file processing
+                files_processed = 0
+                start_ns = time.monotonic_ns()
+                timeout_ns = timeout * 1_000_000_000
+                last_update_ns = start_ns
+                last_output_ns = start_ns
+
+                # Timeout tracking
+                timeout_reached = False
+
+                # Coalesce console output and progress updates so Rich re-renders
+                # at most once per flush window instead of once per line
+                pending_output = []
+                pending_description = None
+                shown_description = None
+                last_flush_ns = start_ns
+
+                def _flush():
+                    nonlocal pending_description, shown_description
+                    if pending_output:
+                        console.print("\n".join(pending_output))
+                        pending_output.clear()
+                    if pending_description is not None and pending_description != shown_description:
+                        progress.update(task, description=pending_description)
+                        shown_description = pending_description
+                    pending_description = None
+
+                while True:
+                    try:
+                        line = output_lines.get(timeout=0.25)
+                    except queue.Empty:
+                        # No output yet; still run the timeout and stall checks
+                        line = ""
+                    else:
+                        if line is None:
+                            _flush()
                             break
-
-                        if line:
-                            # Show all output in verbose mode
-                            console.print(f"[dim]{line}[/dim]")
-                            last_output_time = current_time
-
-                            # Update progress based on various patterns
-                            if any(keyword in line.lower() for keyword in ["processing", "found", "indexing", "chunk", "file"]):
-                                files_processed += 1
-                                elapsed = current_time - start_time
-
-                                # Try to extract filename from the line
-                                filename = "unknown"
-                                if "file" in line.lower():
-                                    # Look for file paths in the line
-                                    path_match = re.search(r'[\/\\]([^\/\\]+\.(ts|js|tsx|jsx|py|html|css|json|yaml|yml|toml|xml|sh|bash|c|cpp|cc|cxx|rs|go|rb|php|swift|kt|java))', line)
-                                    if path_match:
-                                        filename = path_match.group(1)
-
-                                progress.update(
-                                    task,
-                                    description=f"Processing {filename}... ({files_processed}/{len(files_to_process) if files_to_process else '?'} files, {elapsed:.1f}s)"
-                                )
-                            elif "error" in line.lower():
-                                console.print(f"[red]✗ ERROR: {line}[/red]")
-                            elif "warning" in line.lower():
-                                console.print(f"[yellow]⚠ WARNING: {line}[/yellow]")
-                            elif "setup" in line.lower() or "database" in line.lower():
-                                console.print(f"[blue]→ SETUP: {line}[/blue]")
-                            elif "create" in line.lower() or "table" in line.lower():
-                                console.print(f"[cyan]→ DB: {line}[/cyan]")
-
-                            # Update progress every 2 seconds even if no new files
-                            if current_time - last_update_time > 2:
-                                elapsed = current_time - start_time
-                                progress.update(
-                                    task,
-                                    description=f"Processing files... ({files_processed}/{len(files_to_process) if files_to_process else '?'} files, {elapsed:.1f}s)"
-                                )
-                                last_update_time = current_time
-
-                        # Show warning if no output for a while
-                        if current_time - last_output_time > 30:
-                            console.print(f"[yellow]⚠ No output for {current_time - last_output_time:.0f}s - process may be stuck[/yellow]")
-                            last_output_time = current_time
-
-                    if not timeout_reached:
-                        process.wait()
-
-                    if process.returncode == 0 and not timeout_reached:
-                        elapsed = time.time() - start_time
+                        line = line.strip()
+                    now_ns = time.monotonic_ns()
+
+                    # Check for timeout
+                    if now_ns - start_ns > timeout_ns:
+                        _flush()
+                        console.print(f"[red]⚠ TIMEOUT: Process exceeded {timeout}s timeout[/red]")
+                        timeout_reached = True
+                        process.terminate()
+                        break
+
+                    if line:
+                        # Show all output in verbose mode
+                        pending_output.append(f"[dim]{line}[/dim]")
+                        last_output_ns = now_ns
+
+                        # Update progress based on various patterns
+                        match = _LINE_CLASSIFIER.match(line)
+                        kind = match.lastgroup if match else None
+
+                        if kind == 'file' or kind == 'progress':
+                            files_processed += 1
+                            elapsed = (now_ns - start_ns) / 1e9
+
+                            # Try to extract filename from the line
+                            filename = _progress_filename(line) if kind == 'file' else "unknown"
+
+                            pending_description = f"Processing {filename}... ({files_processed}/{len(files_to_process) if files_to_process else '?'} files, {elapsed:.1f}s)"
+                        elif kind == 'error':
+                            pending_output.append(f"[red]✗ ERROR: {line}[/red]")
+                        elif kind == 'warning':
+                            pending_output.append(f"[yellow]⚠ WARNING: {line}[/yellow]")
+                        elif kind == 'setup':
+                            pending_output.append(f"[blue]→ SETUP: {line}[/blue]")
+                        elif kind == 'db':
+                            pending_output.append(f"[cyan]→ DB: {line}[/cyan]")
+
+                        # Update progress every 2 seconds even if no new files
+                        if now_ns - last_update_ns > 2_000_000_000:
+                            elapsed = (now_ns - start_ns) / 1e9
+                            pending_description = f"Processing files... ({files_processed}/{len(files_to_process) if files_to_process else '?'} files, {elapsed:.1f}s)"
+                            last_update_ns = now_ns
+
+                    if not line or now_ns - last_flush_ns >= OUTPUT_FLUSH_NS:
+                        _flush()
+                        last_flush_ns = now_ns
+
+                    # Show warning if no output for a while
+                    if now_ns - last_output_ns > 30_000_000_000:
+                        console.print(f"[yellow]⚠ No output for {(now_ns - last_output_ns) / 1e9:.0f}s - process may be stuck[/yellow]")
+                        last_output_ns = now_ns
+
+                if not timeout_reached:
+                    process.wait()
+
+                if process.returncode == 0 and not timeout_reached:
+                    elapsed = (time.monotonic_ns() - start_ns) / 1e9
+                    progress.update(task, completed=True)
+                    console.print(f"[green]✓ Indexing completed successfully in {elapsed:.1f}s![/green]")
+                    console.print(f"[blue]Processed {files_processed} files[/blue]")
+
+                    # Show statistics
+                    if deferring_index:
+                        build_vector_index(flow_path, path)
+                elif timeout_reached:
+                    console.print(f"[red]✗ Indexing timed out after {timeout}s[/red]")
+                    console.print(f"[yellow]Processed {files_processed} files before timeout[/yellow]")
+                    sys.exit(1)
+                else:
+                    console.print(f"[red]✗ Indexing failed with return code {process.returncode}[/red]")
+                    sys.exit(1)
+        else:
+            # Non-verbose mode with simple progress
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console
+            ) as progress:
+                task = progress.add_task("Indexing files...", total=len(files_to_process) if files_to_process else None)
+                start_time = time.monotonic()
+
+                try:
+                    # Only stderr is ever shown, so don't buffer cocoindex's stdout
+                    result = subprocess.run(
+                        cmd,
+                        cwd=path,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        timeout=timeout
+                    )
+
+                    if result.returncode == 0:
+                        elapsed = time.monotonic() - start_time
                         progress.update(task, completed=True)
                         console.print(f"[green]✓ Indexing completed successfully in {elapsed:.1f}s![/green]")
-                        console.print(f"[blue]Processed {files_processed} files[/blue]")
 
-                        # Show statistics
-                    elif timeout_reached:
-                        console.print(f"[red]✗ Indexing timed out after {timeout}s[/red]")
-                        console.print(f"[yellow]Processed {files_processed} files before timeout[/yellow]")
-                        sys.exit(1)
+                        if deferring_index:
+                            build_vector_index(flow_path, path)
                     else:
-                        console.print(f"[red]✗ Indexing failed with return code {process.returncode}[/red]")
-                        sys.exit(1)
-            else:
-                # Non-verbose mode with simple progress
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    console=console
-                ) as progress:
-                    task = progress.add_task("Indexing files...", total=len(files_to_process) if files_to_process else None)
-                    start_time = time.time()
-
-                    try:
-                        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-
-                        if result.returncode == 0:
-                            elapsed = time.time() - start_time
-                            progress.update(task, completed=True)
-                            console.print(f"[green]✓ Indexing completed successfully in {elapsed:.1f}s![/green]")
-                        else:
-                            console.print(f"[red]Error during indexing:[/red]\n{result.stderr}")
-                            if verbose:
-                                console.print(f"[red]Stdout:[/red]\n{result.stdout}")
-                            sys.exit(1)
-                    except subprocess.TimeoutExpired:
-                        console.print(f"[red]✗ Indexing timed out after {timeout}s[/red]")
+                        console.print(f"[red]Error during indexing:[/red]\n{result.stderr}")
                         sys.exit(1)
-    finally:
-        os.chdir(original_dir)
+                except subprocess.TimeoutExpired:
+                    console.print(f"[red]✗ Indexing timed out after {timeout}s[/red]")
+                    sys.exit(1)
 
 
 
@@ -5,8 +5,6 @@ import sys
 import logging
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
-from rich.syntax import Syntax
 
 from ...query import CodeSearchEngine
 from ..utils import (
@@ -12,13 +12,25 @@ from ..config import (
     DEFAULT_SYMBOL_INDEX_PATH,
     MAX_TOP_SYMBOLS,
     MAX_NODE_TYPES_DISPLAY,
-    DATABASE_URL,
-    USE_POSTGRES
+    DATABASE_URL
 )
 
+try:
+    import orjson
+except ImportError:  # Optional: pip install codesitter[fast]
+    orjson = None
+
 console = Console()
 
 
+def _load_json(path: Path):
+    """Load a JSON index file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
 def get_postgres_stats():
     """Get statistics from PostgreSQL database."""
     import psycopg2
@@ -31,41 +43,44 @@ def get_postgres_stats():
 
         stats = {}
 
-        # Get total chunks
-        cur.execute("SELECT COUNT(*) FROM FlexibleCodeIndex__code_chunks")
-        stats['total_chunks'] = cur.fetchone()[0]
-
-        # Get unique files
-        cur.execute("SELECT COUNT(DISTINCT filename) FROM FlexibleCodeIndex__code_chunks")
-        stats['total_files'] = cur.fetchone()[0]
-
-        # Get language distribution
+        # Scalar totals in a single scan
         cur.execute("""
-            SELECT language, COUNT(*) as count
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT filename),
+                COALESCE(SUM(LENGTH(chunk_text)), 0)
             FROM FlexibleCodeIndex__code_chunks
-            GROUP BY language
-            ORDER BY count DESC
         """)
-        stats['languages'] = cur.fetchall()
-
-        # Get total text size (approximate)
-        cur.execute("SELECT SUM(LENGTH(chunk_text)) FROM FlexibleCodeIndex__code_chunks")
-        total_chars = cur.fetchone()[0] or 0
+        total_chunks, total_files, total_chars = cur.fetchone()
+        stats['total_chunks'] = total_chunks
+        stats['total_files'] = total_files
         stats['total_chars'] = total_chars
         stats['estimated_lines'] = total_chars // 80  # Rough estimate
 
-        # Get file extensions
+        # Language and extension distributions in one round-trip, tagged by kind
         cur.execute("""
-            SELECT
-                SUBSTRING(filename FROM '\\.[^.]+$') as ext,
-                COUNT(DISTINCT filename) as count
-            FROM FlexibleCodeIndex__code_chunks
-            WHERE filename LIKE '%.%'
-            GROUP BY ext
-            ORDER BY count DESC
-            LIMIT 10
+            SELECT kind, k, v FROM (
+                (SELECT 'language'::TEXT AS kind, language::TEXT AS k, COUNT(*)::BIGINT AS v
+                 FROM FlexibleCodeIndex__code_chunks
+                 GROUP BY language)
+                UNION ALL
+                (SELECT 'extension', ext, COUNT(DISTINCT filename)
+                 FROM (
+                     SELECT filename, LOWER(SUBSTRING(filename FROM '\\.[^./\\\\]+$')) AS ext
+                     FROM FlexibleCodeIndex__code_chunks
+                 ) files
+                 WHERE ext IS NOT NULL
+                 GROUP BY ext
+                 ORDER BY 3 DESC
+                 LIMIT 10)
+            ) dist
+            ORDER BY kind, v DESC
         """)
-        stats['extensions'] = cur.fetchall()
+        stats['languages'] = []
+        stats['extensions'] = []
+        for kind, key, count in cur.fetchall():
+            target = stats['languages'] if kind == 'language' else stats['extensions']
+            target.append((key, count))
 
         cur.close()
         conn.close()
@@ -144,45 +159,43 @@ def stats(postgres):
 
         # Load and analyze indices
         if code_index_path.exists():
-            with open(code_index_path, 'r') as f:
-                code_data = json.load(f)
+            code_data = _load_json(code_index_path)
 
-                # Count unique files
-                files = set()
-                total_lines = 0
-                node_types = {}
+            # Count unique files
+            files = set()
+            total_lines = 0
+            node_types = {}
 
-                for item in code_data:
-                    chunk_data = item.get('chunk_data', {})
-                    files.add(chunk_data.get('filename', ''))
+            for item in code_data:
+                chunk_data = item.get('chunk_data', {})
+                files.add(chunk_data.get('filename', ''))
 
-                    # Count node types
-                    node_type = chunk_data.get('node_type', 'unknown')
-                    node_types[node_type] = node_types.get(node_type, 0) + 1
+                # Count node types
+                node_type = chunk_data.get('node_type', 'unknown')
+                node_types[node_type] = node_types.get(node_type, 0) + 1
 
-                    # Estimate lines
-                    start = chunk_data.get('start_line', 0)
-                    end = chunk_data.get('end_line', 0)
-                    if end > start:
-                        total_lines += (end - start)
+                # Estimate lines
+                start = chunk_data.get('start_line', 0)
+                end = chunk_data.get('end_line', 0)
+                if end > start:
+                    total_lines += (end - start)
 
-                stats_table.add_row("Total files", str(len(files)))
-                stats_table.add_row("Total chunks", str(len(code_data)))
-                stats_table.add_row("Estimated lines", str(total_lines))
+            stats_table.add_row("Total files", str(len(files)))
+            stats_table.add_row("Total chunks", str(len(code_data)))
+            stats_table.add_row("Estimated lines", str(total_lines))
 
         if symbol_index_path.exists():
-            with open(symbol_index_path, 'r') as f:
-                symbols = json.load(f)
-                stats_table.add_row("Unique symbols", str(len(symbols)))
-
-                # Find most referenced symbols
-                symbol_counts = [(name, len(locs)) for name, locs in symbols.items()]
-                symbol_counts.sort(key=lambda x: x[1], reverse=True)
-
-                if symbol_counts:
-                    top_symbols = ", ".join([f"{name} ({count})"
-                                           for name, count in symbol_counts[:MAX_TOP_SYMBOLS]])
-                    stats_table.add_row("Top symbols", top_symbols)
+            symbols = _load_json(symbol_index_path)
+            stats_table.add_row("Unique symbols", str(len(symbols)))
+
+            # Find most referenced symbols
+            symbol_counts = [(name, len(locs)) for name, locs in symbols.items()]
+            symbol_counts.sort(key=lambda x: x[1], reverse=True)
+
+            if symbol_counts:
+                top_symbols = ", ".join([f"{name} ({count})"
+                                       for name, count in symbol_counts[:MAX_TOP_SYMBOLS]])
+                stats_table.add_row("Top symbols", top_symbols)
 
         console.print(stats_table)
 
@@ -1,6 +1,7 @@
 """Configuration for codesitter CLI."""
 
 import os
+import types
 from pathlib import Path
 
 # Default paths
@@ -37,6 +38,27 @@ ANALYZER_SIMPLE_FLOW_PATH = FLOW_DIR / "analyzer_simple.py"
 ANALYZER_DETAILED_FLOW_PATH = FLOW_DIR / "analyzer_detailed.py"
 SMART_CHUNKING_FLOW_PATH = FLOW_DIR / "smart_chunking.py"
 
+# Flow name (as accepted by `index --flow`) to flow file
+FLOW_MAP = types.MappingProxyType({
+    'basic': BASIC_FLOW_PATH,
+    'simple': SIMPLE_FLOW_PATH,
+    'enhanced': ENHANCED_FLOW_PATH,
+    'flexible': FLEXIBLE_FLOW_PATH,
+    'flexible_no_vector': FLEXIBLE_NO_VECTOR_FLOW_PATH,
+    'minimal_flexible': MINIMAL_FLEXIBLE_FLOW_PATH,
+    'minimal': MINIMAL_FLOW_PATH,
+    'analyzer_aware': ANALYZER_AWARE_FLOW_PATH,
+    'analyzer_advanced': ANALYZER_ADVANCED_FLOW_PATH,
+    'analyzer_simple': ANALYZER_SIMPLE_FLOW_PATH,
+    'analyzer_detailed': ANALYZER_DETAILED_FLOW_PATH,
+    'smart_chunking': SMART_CHUNKING_FLOW_PATH
+})
+
+# Flows whose exports declare their vector index through
+# flows.embedding.embedding_vector_indexes, so it can be built after the load
+# (`index --defer-vector-index`)
+DEFERRED_INDEX_FLOWS = frozenset({'analyzer_aware', 'analyzer_detailed'})
+
 # Display settings
 MAX_CODE_PREVIEW_LENGTH = 400
 MAX_TOP_SYMBOLS = 10
@@ -8,6 +8,8 @@ import os
 from typing import List, Any, Literal, Dict
 from pathlib import Path
 import dataclasses
+import itertools
+from collections import Counter
 
 from cocoindex import (
     FlowBuilder,
@@ -16,33 +18,35 @@ from cocoindex import (
     op,
     flow_def,
     DataScope,
-    VectorIndexDef,
-    VectorSimilarityMetric,
     Vector,
     transform_flow,
     DataSlice,
 )
 from cocoindex.targets import Postgres
 
-from sentence_transformers import SentenceTransformer
 import logging
 
 from codesitter.analyzers import (
     get_registry,
-    auto_discover_analyzers,
-    register_defaults,
+    ensure_initialized,
     get_analyzer,
 )
-from codesitter.analyzers.base import CodeChunk
+from codesitter.flows.files import EXCLUDED_DIRS, EXCLUDED_PATTERNS
+from codesitter.flows.embedding import (
+    EMBED_MODEL,
+    DedupedSentenceTransformerEmbed,
+    embedder_args,
+    embedding_column_options,
+    embedding_vector_indexes,
+)
+from codesitter.flows.parallel import analyze_custom_metadata, run_analysis
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize analyzer registry
-logger.info("Initializing language analyzers...")
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # Log supported extensions
 registry = get_registry()
@@ -60,10 +64,6 @@ class ChunkMetadata:
     has_async_functions: bool = False
     is_test_file: bool = False
 
-@op.function()
-def extract_extension(filename: str) -> str:
-    return os.path.splitext(filename)[1].lower()
-
 @op.function()
 def get_language(filename: str) -> str:
     analyzer = get_analyzer(filename)
@@ -75,34 +75,23 @@ def get_language(filename: str) -> str:
 def text_to_embedding(text: DataSlice[str]) -> DataSlice[Vector[float, Literal[384]]]:
     """Transform text to embedding using SentenceTransformer."""
     return text.transform(
-        functions.SentenceTransformerEmbed(
-            model="all-MiniLM-L6-v2"
+        DedupedSentenceTransformerEmbed(
+            model=EMBED_MODEL,
+            args=embedder_args(),
         )
     )
 
-@op.function()
-def extract_chunk_metadata(chunk_text: str, filename: str) -> ChunkMetadata:
+# Cached by cocoindex on (chunk_text, filename, language); bump behavior_version
+# when the analyzers change what they report
+@op.function(cache=True, behavior_version=2)
+async def extract_chunk_metadata(chunk_text: str, filename: str, language: str) -> ChunkMetadata:
     """Extract metadata from a chunk using the appropriate analyzer."""
-    analyzer = get_analyzer(filename)
-
     # Default metadata
     metadata = ChunkMetadata()
 
-    if not analyzer or analyzer.language_name == "default":
-        return metadata
-
-    # Create minimal CodeChunk for metadata extraction
-    chunk_obj = CodeChunk(
-        text=chunk_text,
-        filename=filename,
-        start_line=0,
-        end_line=0,
-        node_type="",
-        symbols=[]
-    )
-
     try:
-        custom_metadata = analyzer.extract_custom_metadata(chunk_obj)
+        # Parsed in the analyzer process pool when CODESITTER_ANALYZER_WORKERS > 1
+        custom_metadata = await run_analysis(analyze_custom_metadata, chunk_text, filename, language)
         # Update dataclass fields with actual metadata
         if custom_metadata:
             metadata.is_react_component = custom_metadata.get("is_react_component", False)
@@ -116,45 +105,26 @@ def extract_chunk_metadata(chunk_text: str, filename: str) -> ChunkMetadata:
 
     return metadata
 
-# Individual extractor functions for each metadata field
-@op.function()
-def get_is_react_component(metadata: ChunkMetadata) -> bool:
-    return metadata.is_react_component
-
-@op.function()
-def get_has_interfaces(metadata: ChunkMetadata) -> bool:
-    return metadata.has_interfaces
-
-@op.function()
-def get_has_type_aliases(metadata: ChunkMetadata) -> bool:
-    return metadata.has_type_aliases
-
-@op.function()
-def get_has_enums(metadata: ChunkMetadata) -> bool:
-    return metadata.has_enums
-
-@op.function()
-def get_has_async_functions(metadata: ChunkMetadata) -> bool:
-    return metadata.has_async_functions
-
-@op.function()
-def get_is_test_file(metadata: ChunkMetadata) -> bool:
-    return metadata.is_test_file
-
-# Global counter for progress tracking
-_progress_counter = {"current": 0, "total": 0}
+# Progress tracking. The op runs on cocoindex worker threads; next() on an
+# itertools.count is atomic, unlike a read-modify-write on a dict entry
+PROGRESS_LOG_EVERY = 100
+_progress_count = itertools.count(1)
+_progress_total = 0
 
 @op.function()
 def log_file_with_progress(filename: str, language: str) -> str:
-    """Log file processing with progress counter."""
-    _progress_counter["current"] += 1
-    current = _progress_counter["current"]
-    total = _progress_counter["total"]
+    """Log every PROGRESS_LOG_EVERY-th file processed, and the last one."""
+    current = next(_progress_count)
+    total = _progress_total
 
-    if total > 0:
-        logger.info(f"[{current}/{total}] Processing file: {filename} [Language: {language}]")
-    else:
-        logger.info(f"Processing file: {filename} [Language: {language}]")
+    if current % PROGRESS_LOG_EVERY and current != total:
+        return filename
+
+    if logger.isEnabledFor(logging.INFO):
+        if total > 0:
+            logger.info(f"[{current}/{total}] Processing file: {filename} [Language: {language}]")
+        else:
+            logger.info(f"Processing file: {filename} [Language: {language}]")
 
     return filename
 
@@ -164,38 +134,34 @@ def analyzer_aware_flow(flow_builder: FlowBuilder, data_scope: DataScope):
     patterns = [f"**/*{ext}" for ext in supported_exts.keys()]
     logger.info(f"Searching for files with patterns: {patterns}")
 
-    # Pre-scan to count files (optional - for visibility)
-    import glob
-    from pathlib import Path
-    current_dir = Path(".")
-    excluded_dirs = {"node_modules", "cdk.out", "dist", "build", ".git"}
+    # Pre-scan to count files (optional - for visibility). One walk over the
+    # tree, pruning excluded directories, instead of a glob per extension
+    allowed_exts = set(supported_exts.keys())
 
-    total_files = 0
-    files_by_ext = {}
+    files_by_ext = Counter()
+    for _root, dirs, files in os.walk("."):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        for name in files:
+            dot = name.rfind(".")
+            if dot >= 0 and name[dot:] in allowed_exts:
+                files_by_ext[name[dot:]] += 1
 
-    for pattern in patterns:
-        for file_path in current_dir.glob(pattern):
-            # Skip if in excluded directory
-            if any(excluded in file_path.parts for excluded in excluded_dirs):
-                continue
-
-            total_files += 1
-            ext = file_path.suffix
-            files_by_ext[ext] = files_by_ext.get(ext, 0) + 1
+    total_files = sum(files_by_ext.values())
 
     logger.info(f"Found {total_files} files to process")
     if files_by_ext:
         logger.info(f"Files by extension: {dict(sorted(files_by_ext.items()))}")
 
     # Set total for progress tracking
-    global _progress_counter
-    _progress_counter = {"current": 0, "total": total_files}
+    global _progress_count, _progress_total
+    _progress_count = itertools.count(1)
+    _progress_total = total_files
 
     data_scope["files"] = flow_builder.add_source(
         sources.LocalFile(
             path=".",
             included_patterns=patterns,
-            excluded_patterns=["**/node_modules/**","**/cdk.out/**", "**/dist/**", "**/build/**", "**/.git/**"],
+            excluded_patterns=EXCLUDED_PATTERNS,
         )
     )
 
@@ -204,7 +170,6 @@ def analyzer_aware_flow(flow_builder: FlowBuilder, data_scope: DataScope):
 
     # 3. Process each file
     with data_scope["files"].row() as file:
-        file["ext"] = file["filename"].transform(extract_extension)
         file["language"] = file["filename"].transform(get_language)
 
         # Log file processing with progress
@@ -228,17 +193,10 @@ def analyzer_aware_flow(flow_builder: FlowBuilder, data_scope: DataScope):
             # Extract metadata as a dataclass
             chunk["metadata"] = chunk["text"].transform(
                 extract_chunk_metadata,
-                filename=file["filename"]
+                filename=file["filename"],
+                language=file["language"]
             )
 
-            # Extract individual metadata fields
-            chunk["is_react_component"] = chunk["metadata"].transform(get_is_react_component)
-            chunk["has_interfaces"] = chunk["metadata"].transform(get_has_interfaces)
-            chunk["has_type_aliases"] = chunk["metadata"].transform(get_has_type_aliases)
-            chunk["has_enums"] = chunk["metadata"].transform(get_has_enums)
-            chunk["has_async_functions"] = chunk["metadata"].transform(get_has_async_functions)
-            chunk["is_test_file"] = chunk["metadata"].transform(get_is_test_file)
-
             # Collect all chunk data including metadata
             chunk_collector.collect(
                 filename=file["filename"],
@@ -246,13 +204,13 @@ def analyzer_aware_flow(flow_builder: FlowBuilder, data_scope: DataScope):
                 chunk_text=chunk["text"],
                 embedding=chunk["embedding"],
                 language=file["language"],
-                # Metadata fields
-                is_react_component=chunk["is_react_component"],
-                has_interfaces=chunk["has_interfaces"],
-                has_type_aliases=chunk["has_type_aliases"],
-                has_enums=chunk["has_enums"],
-                has_async_functions=chunk["has_async_functions"],
-                is_test_file=chunk["is_test_file"],
+                # Metadata fields, read straight off the struct
+                is_react_component=chunk["metadata"]["is_react_component"],
+                has_interfaces=chunk["metadata"]["has_interfaces"],
+                has_type_aliases=chunk["metadata"]["has_type_aliases"],
+                has_enums=chunk["metadata"]["has_enums"],
+                has_async_functions=chunk["metadata"]["has_async_functions"],
+                is_test_file=chunk["metadata"]["is_test_file"],
             )
 
     # 4. Export to storage
@@ -260,9 +218,9 @@ def analyzer_aware_flow(flow_builder: FlowBuilder, data_scope: DataScope):
         # Export chunks with embeddings and metadata
         chunk_collector.export(
             "code_chunks_with_metadata",
-            Postgres(),
+            Postgres(column_options=embedding_column_options()),
             primary_key_fields=["filename", "location"],
-            vector_indexes=[VectorIndexDef("embedding", VectorSimilarityMetric.COSINE_SIMILARITY)],
+            vector_indexes=embedding_vector_indexes(),
         )
 
         logger.info("Data exported to PostgreSQL table: code_chunks_with_metadata")
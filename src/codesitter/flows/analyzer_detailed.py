@@ -16,33 +16,48 @@ from cocoindex import (
     op,
     flow_def,
     DataScope,
-    VectorIndexDef,
-    VectorSimilarityMetric,
     Vector,
     transform_flow,
     DataSlice,
 )
 from cocoindex.targets import Postgres
 
-from sentence_transformers import SentenceTransformer
 import logging
 
 from codesitter.analyzers import (
     get_registry,
-    auto_discover_analyzers,
-    register_defaults,
+    ensure_initialized,
     get_analyzer,
 )
-from codesitter.analyzers.base import CodeChunk, CallRelationship
+from codesitter.flows.files import EXCLUDED_PATTERNS
+from codesitter.flows.embedding import (
+    EMBED_MODEL,
+    DedupedSentenceTransformerEmbed,
+    embedder_args,
+    embedding_column_options,
+    embedding_vector_indexes,
+)
+from codesitter.flows.parallel import analyze_call_relationships, run_analysis
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install codesitter[fast]
+    orjson = None
+
+EMPTY_JSON_ARRAY = "[]"
+
+def _dumps(value) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize analyzer registry
-logger.info("Initializing language analyzers...")
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # Data classes for structured data
 @dataclasses.dataclass
@@ -55,10 +70,6 @@ class FunctionSignature:
     is_export: bool = False
     docstring: str = ""
 
-@op.function()
-def extract_extension(filename: str) -> str:
-    return os.path.splitext(filename)[1].lower()
-
 @op.function()
 def get_language(filename: str) -> str:
     analyzer = get_analyzer(filename)
@@ -70,8 +81,9 @@ def get_language(filename: str) -> str:
 def text_to_embedding(text: DataSlice[str]) -> DataSlice[Vector[float, Literal[384]]]:
     """Transform text to embedding using SentenceTransformer."""
     return text.transform(
-        functions.SentenceTransformerEmbed(
-            model="all-MiniLM-L6-v2"
+        DedupedSentenceTransformerEmbed(
+            model=EMBED_MODEL,
+            args=embedder_args(),
         )
     )
 
@@ -84,40 +96,17 @@ def extract_function_signatures(chunk_text: str, filename: str) -> str:
     # - Parameter names and types
     # - Return types
     # - JSDoc comments
-    return json.dumps([])
+    return EMPTY_JSON_ARRAY
 
-@op.function()
-def extract_call_relationships_json(chunk_text: str, filename: str) -> str:
+@op.function(cache=True, behavior_version=2)
+async def extract_call_relationships_json(chunk_text: str, filename: str, language: str) -> str:
     """Extract call relationships and return as JSON string."""
-    analyzer = get_analyzer(filename)
-
-    if not analyzer or analyzer.language_name == "default":
-        return json.dumps([])
-
-    # Create CodeChunk for analysis
-    chunk_obj = CodeChunk(
-        text=chunk_text,
-        filename=filename,
-        start_line=0,
-        end_line=0,
-        node_type="",
-        symbols=[]
-    )
-
     try:
-        calls = []
-        for call in analyzer.extract_call_relationships(chunk_obj):
-            calls.append({
-                "caller": call.caller,
-                "callee": call.callee,
-                "arguments": call.arguments,
-                "line": call.line,
-                "column": call.column
-            })
-        return json.dumps(calls)
+        calls = await run_analysis(analyze_call_relationships, chunk_text, filename, language)
+        return _dumps(calls)
     except Exception as e:
         logger.error(f"Error extracting calls from {filename}: {e}")
-        return json.dumps([])
+        return EMPTY_JSON_ARRAY
 
 @flow_def(name="DetailedCodeAnalysis")
 def detailed_analysis_flow(flow_builder: FlowBuilder, data_scope: DataScope):
@@ -130,7 +119,7 @@ def detailed_analysis_flow(flow_builder: FlowBuilder, data_scope: DataScope):
         sources.LocalFile(
             path=".",
             included_patterns=patterns,
-            excluded_patterns=["**/node_modules/**", "**/cdk.out/**", "**/dist/**", "**/build/**", "**/.git/**"],
+            excluded_patterns=EXCLUDED_PATTERNS,
         )
     )
 
@@ -141,7 +130,6 @@ def detailed_analysis_flow(flow_builder: FlowBuilder, data_scope: DataScope):
 
     # 3. Process each file
     with data_scope["files"].row() as file:
-        file["ext"] = file["filename"].transform(extract_extension)
         file["language"] = file["filename"].transform(get_language)
 
         # Chunk the file
@@ -165,7 +153,8 @@ def detailed_analysis_flow(flow_builder: FlowBuilder, data_scope: DataScope):
             # Extract call relationships
             chunk["call_relationships"] = chunk["text"].transform(
                 extract_call_relationships_json,
-                filename=file["filename"]
+                filename=file["filename"],
+                language=file["language"]
             )
 
             # Collect chunk data
@@ -184,9 +173,9 @@ def detailed_analysis_flow(flow_builder: FlowBuilder, data_scope: DataScope):
         # Main chunks table with detailed analysis
         chunk_collector.export(
             "code_chunks_detailed",
-            Postgres(),
+            Postgres(column_options=embedding_column_options()),
             primary_key_fields=["filename", "location"],
-            vector_indexes=[VectorIndexDef("embedding", VectorSimilarityMetric.COSINE_SIMILARITY)],
+            vector_indexes=embedding_vector_indexes(),
         )
 
         logger.info("Detailed analysis exported to PostgreSQL")
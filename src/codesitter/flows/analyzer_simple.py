@@ -4,19 +4,25 @@ Simplified Analyzer-Aware Flow (Corrected)
 Following CocoIndex code_embedding example exactly.
 """
 
-import os
+import dataclasses
 from typing import Literal
 from pathlib import Path
 
 import cocoindex
-from sentence_transformers import SentenceTransformer
 import logging
 
 from codesitter.analyzers import (
     get_registry,
-    auto_discover_analyzers,
-    register_defaults,
+    ensure_initialized,
     get_analyzer,
+    file_extension,
+)
+from codesitter.flows.files import EXCLUDED_PATTERNS
+from codesitter.flows.embedding import (
+    EMBED_MODEL,
+    DedupedSentenceTransformerEmbed,
+    embedder_args,
+    embedding_column_options,
 )
 from codesitter.analyzers.base import CodeChunk
 
@@ -25,19 +31,21 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize analyzer registry
-logger.info("Initializing language analyzers...")
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # Log supported extensions
 registry = get_registry()
 supported_exts = registry.list_supported_extensions()
 logger.info(f"Registered language support for: {list(supported_exts.keys())}")
 
-@cocoindex.op.function()
-def extract_extension(filename: str) -> str:
-    """Extract file extension."""
-    return os.path.splitext(filename)[1].lower()
+# Languages for extensions with no registered analyzer
+FALLBACK_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".jsx": "javascript",
+}
 
 @cocoindex.op.function()
 def get_language(filename: str) -> str:
@@ -46,14 +54,7 @@ def get_language(filename: str) -> str:
     if analyzer:
         return analyzer.language_name
     # Fallback mapping
-    ext = extract_extension(filename)
-    return {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".tsx": "typescript",
-        ".jsx": "javascript",
-    }.get(ext, "text")
+    return FALLBACK_LANGUAGES.get(file_extension(filename), "text")
 
 @cocoindex.transform_flow()
 def text_to_embedding(
@@ -61,84 +62,30 @@ def text_to_embedding(
 ) -> cocoindex.DataSlice[cocoindex.Vector[float, Literal[384]]]:
     """Embed text using SentenceTransformer."""
     return text.transform(
-        cocoindex.functions.SentenceTransformerEmbed(
-            model="all-MiniLM-L6-v2"
+        DedupedSentenceTransformerEmbed(
+            model=EMBED_MODEL,
+            args=embedder_args(),
         )
     )
 
-# Individual metadata extraction functions
-@cocoindex.op.function()
-def is_react_component(text: str, filename: str) -> bool:
-    """Check if chunk contains a React component."""
-    analyzer = get_analyzer(filename)
-    if not analyzer or analyzer.language_name == "default":
-        return False
-
-    chunk_obj = CodeChunk(
-        text=text,
-        filename=filename,
-        start_line=0,
-        end_line=0,
-        node_type="",
-        symbols=[]
-    )
-
-    try:
-        metadata = analyzer.extract_custom_metadata(chunk_obj)
-        return metadata.get("is_react_component", False)
-    except:
-        return False
-
-@cocoindex.op.function()
-def has_interfaces(text: str, filename: str) -> bool:
-    """Check if chunk has TypeScript interfaces."""
-    analyzer = get_analyzer(filename)
-    if not analyzer or analyzer.language_name == "default":
-        return False
-
-    chunk_obj = CodeChunk(
-        text=text,
-        filename=filename,
-        start_line=0,
-        end_line=0,
-        node_type="",
-        symbols=[]
-    )
-
-    try:
-        metadata = analyzer.extract_custom_metadata(chunk_obj)
-        return metadata.get("has_interfaces", False)
-    except:
-        return False
-
-@cocoindex.op.function()
-def has_type_aliases(text: str, filename: str) -> bool:
-    """Check if chunk has TypeScript type aliases."""
-    analyzer = get_analyzer(filename)
-    if not analyzer or analyzer.language_name == "default":
-        return False
-
-    chunk_obj = CodeChunk(
-        text=text,
-        filename=filename,
-        start_line=0,
-        end_line=0,
-        node_type="",
-        symbols=[]
-    )
-
-    try:
-        metadata = analyzer.extract_custom_metadata(chunk_obj)
-        return metadata.get("has_type_aliases", False)
-    except:
-        return False
-
-@cocoindex.op.function()
-def has_async_functions(text: str, filename: str) -> bool:
-    """Check if chunk has async functions."""
-    analyzer = get_analyzer(filename)
+@dataclasses.dataclass
+class ChunkMetadata:
+    """Analyzer flags for a code chunk."""
+    is_react_component: bool = False
+    has_interfaces: bool = False
+    has_type_aliases: bool = False
+    has_async_functions: bool = False
+    is_test_file: bool = False
+
+@cocoindex.op.function(cache=True, behavior_version=2)
+def extract_chunk_metadata(text: str, filename: str, language: str) -> ChunkMetadata:
+    """Run the file's analyzer once and return all metadata flags for the chunk."""
+    metadata = ChunkMetadata()
+
+    # language is resolved once per file; avoid re-deriving it from the filename
+    analyzer = registry.get_analyzer_by_language(language)
     if not analyzer or analyzer.language_name == "default":
-        return False
+        return metadata
 
     chunk_obj = CodeChunk(
         text=text,
@@ -150,32 +97,16 @@ def has_async_functions(text: str, filename: str) -> bool:
     )
 
     try:
-        metadata = analyzer.extract_custom_metadata(chunk_obj)
-        return metadata.get("has_async_functions", False)
+        custom = analyzer.extract_custom_metadata(chunk_obj)
     except:
-        return False
-
-@cocoindex.op.function()
-def is_test_file(text: str, filename: str) -> bool:
-    """Check if this is a test file."""
-    analyzer = get_analyzer(filename)
-    if not analyzer or analyzer.language_name == "default":
-        return False
-
-    chunk_obj = CodeChunk(
-        text=text,
-        filename=filename,
-        start_line=0,
-        end_line=0,
-        node_type="",
-        symbols=[]
-    )
+        return metadata
 
-    try:
-        metadata = analyzer.extract_custom_metadata(chunk_obj)
-        return metadata.get("is_test_file", False)
-    except:
-        return False
+    metadata.is_react_component = custom.get("is_react_component", False)
+    metadata.has_interfaces = custom.get("has_interfaces", False)
+    metadata.has_type_aliases = custom.get("has_type_aliases", False)
+    metadata.has_async_functions = custom.get("has_async_functions", False)
+    metadata.is_test_file = custom.get("is_test_file", False)
+    return metadata
 
 @cocoindex.flow_def(name="CodeAnalyzerFlow")
 def code_analyzer_flow(
@@ -190,7 +121,7 @@ def code_analyzer_flow(
         cocoindex.sources.LocalFile(
             path=".",
             included_patterns=patterns,
-            excluded_patterns=["**/node_modules/**", "**/dist/**", "**/build/**", "**/.git/**"],
+            excluded_patterns=EXCLUDED_PATTERNS,
         )
     )
 
@@ -199,7 +130,6 @@ def code_analyzer_flow(
 
     # Process files
     with data_scope["files"].row() as file:
-        file["extension"] = file["filename"].transform(extract_extension)
         file["language"] = file["filename"].transform(get_language)
 
         # Chunk the file
@@ -216,25 +146,10 @@ def code_analyzer_flow(
             chunk["embedding"] = chunk["text"].call(text_to_embedding)
 
             # Analyze metadata
-            chunk["is_react"] = chunk["text"].transform(
-                is_react_component,
-                filename=file["filename"]
-            )
-            chunk["has_interfaces_flag"] = chunk["text"].transform(
-                has_interfaces,
-                filename=file["filename"]
-            )
-            chunk["has_types"] = chunk["text"].transform(
-                has_type_aliases,
-                filename=file["filename"]
-            )
-            chunk["has_async"] = chunk["text"].transform(
-                has_async_functions,
-                filename=file["filename"]
-            )
-            chunk["is_test"] = chunk["text"].transform(
-                is_test_file,
-                filename=file["filename"]
+            chunk["metadata"] = chunk["text"].transform(
+                extract_chunk_metadata,
+                filename=file["filename"],
+                language=file["language"]
             )
 
             # Collect data
@@ -245,17 +160,17 @@ def code_analyzer_flow(
                 embedding=chunk["embedding"],
                 language=file["language"],
                 # Metadata fields
-                is_react_component=chunk["is_react"],
-                has_interfaces=chunk["has_interfaces_flag"],
-                has_type_aliases=chunk["has_types"],
-                has_async_functions=chunk["has_async"],
-                is_test_file=chunk["is_test"],
+                is_react_component=chunk["metadata"]["is_react_component"],
+                has_interfaces=chunk["metadata"]["has_interfaces"],
+                has_type_aliases=chunk["metadata"]["has_type_aliases"],
+                has_async_functions=chunk["metadata"]["has_async_functions"],
+                is_test_file=chunk["metadata"]["is_test_file"],
             )
 
     # Export to PostgreSQL
     code_embeddings.export(
         "code_analysis",
-        cocoindex.targets.Postgres(),
+        cocoindex.targets.Postgres(column_options=embedding_column_options()),
         primary_key_fields=["filename", "location"],
         vector_indexes=[
             cocoindex.VectorIndexDef(
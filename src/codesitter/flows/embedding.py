@@ -0,0 +1,233 @@
+"""
+Embedder Settings
+
+Shared SentenceTransformer options and model for the flows that embed chunks
+and for query-time search, and the embedding op the flows use.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from cocoindex import VectorIndexDef, VectorSimilarityMetric, op
+from cocoindex.functions import SentenceTransformerEmbed
+from cocoindex.functions.sbert import SentenceTransformerEmbedExecutor
+from cocoindex.targets import PostgresColumnOptions
+from numpy.typing import NDArray
+
+logger = logging.getLogger(__name__)
+
+# encode() draws a tqdm progress bar on every call while its logger is at INFO,
+# which the flows' logging.basicConfig(level=logging.INFO) turns on
+logging.getLogger("sentence_transformers").setLevel(logging.WARNING)
+
+EMBED_MODEL = "all-MiniLM-L6-v2"
+
+# Dynamically quantized int8 export shipped in the all-MiniLM-L6-v2 repo; uses
+# AVX-512 VNNI dot products where the CPU has them
+DEFAULT_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# SBERT inference on CPU stops scaling beyond 4-8 intra-op threads
+DEFAULT_CPU_THREADS = min(8, os.cpu_count() or 1)
+
+# Shared SentenceTransformer, loaded on first use so importing a flow stays cheap
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def embedder_args() -> Optional[Dict[str, Any]]:
+    """
+    Build the SentenceTransformer constructor arguments from the environment.
+
+    CODESITTER_EMBED_BACKEND=onnx runs the model on ONNX Runtime using the
+    quantized export named by CODESITTER_EMBED_ONNX_FILE (default
+    DEFAULT_ONNX_FILE). Otherwise CODESITTER_EMBED_DTYPE, e.g. "bfloat16",
+    sets the torch weight dtype; "auto" picks float16 when the model will run
+    on CUDA and leaves float32 on CPU. CODESITTER_EMBED_DEVICE, e.g. "cuda:1",
+    overrides SentenceTransformer's default of CUDA when available, else CPU.
+
+    Returns:
+        Arguments for DedupedSentenceTransformerEmbed(args=...), or None for defaults
+    """
+    args: Dict[str, Any] = {}
+    backend = os.getenv("CODESITTER_EMBED_BACKEND", "torch").lower()
+    device = os.getenv("CODESITTER_EMBED_DEVICE")
+
+    if backend == "onnx":
+        args["backend"] = "onnx"
+        args["model_kwargs"] = {
+            "file_name": os.getenv("CODESITTER_EMBED_ONNX_FILE", DEFAULT_ONNX_FILE),
+        }
+    else:
+        dtype = os.getenv("CODESITTER_EMBED_DTYPE")
+        if dtype == "auto":
+            dtype = _half_dtype_for(device)
+        if dtype:
+            args["model_kwargs"] = {"torch_dtype": dtype}
+
+    if device:
+        args["device"] = device
+
+    return args or None
+
+
+def _half_dtype_for(device: Optional[str]) -> Optional[str]:
+    """float16 if the model will be placed on a CUDA device, else None (float32)."""
+    if device and not device.startswith("cuda"):
+        return None
+
+    import torch
+
+    return "float16" if torch.cuda.is_available() else None
+
+
+def limit_cpu_threads() -> None:
+    """
+    Cap torch's intra-op thread pool before the model is loaded.
+
+    Uses CODESITTER_EMBED_THREADS, defaulting to DEFAULT_CPU_THREADS.
+    """
+    import torch
+
+    torch.set_num_threads(int(os.getenv("CODESITTER_EMBED_THREADS", DEFAULT_CPU_THREADS)))
+
+
+def quantize_model(model: Any) -> None:
+    """
+    Dynamically quantize a loaded SentenceTransformer's Linear layers to int8.
+
+    Applied when CODESITTER_EMBED_QUANTIZE=int8. Dynamic quantization runs on
+    CPU only, and does not apply to the ONNX backend, which loads an already
+    quantized export; on GPU use CODESITTER_EMBED_DTYPE=float16 instead.
+    """
+    if os.getenv("CODESITTER_EMBED_QUANTIZE", "").lower() != "int8":
+        return
+
+    import torch
+
+    transformer = model[0]
+    if not isinstance(transformer.auto_model, torch.nn.Module) or model.device.type != "cpu":
+        logger.warning("CODESITTER_EMBED_QUANTIZE=int8 needs the torch backend on CPU; ignoring")
+        return
+
+    transformer.auto_model = torch.quantization.quantize_dynamic(
+        transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def get_embedder() -> Any:
+    """
+    The process-wide SentenceTransformer for EMBED_MODEL, with embedder_args().
+
+    The first call loads the model under a lock, so that cocoindex worker
+    threads embedding their first batches at the same time do not each load
+    a copy.
+    """
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                from sentence_transformers import SentenceTransformer
+
+                limit_cpu_threads()
+                model = SentenceTransformer(EMBED_MODEL, **(embedder_args() or {}))
+                quantize_model(model)
+                _embedder = model
+    return _embedder
+
+
+def embed_distinct(
+    texts: List[str],
+    encode: Optional[Callable[[List[str]], Sequence[NDArray[np.float32]]]] = None,
+) -> List[NDArray[np.float32]]:
+    """
+    Embed a batch of texts, encoding each distinct text once.
+
+    Overlapping chunks of similar files repeat the same import blocks, license
+    banners and boilerplate, so a batch often holds identical texts. Texts are
+    compared and encoded with surrounding whitespace stripped; every text,
+    including an empty or blank one, gets the embedding of its stripped form.
+
+    Args:
+        texts: The batch to embed
+        encode: Encodes a list of distinct texts to one row each; defaults to
+            the shared get_embedder() model
+
+    Returns:
+        One float32 row per text, in order
+    """
+    slots: Dict[str, int] = {}
+    positions = [slots.setdefault(text.strip(), len(slots)) for text in texts]
+    if not slots:
+        return []
+
+    encoded = (encode or _encode)(list(slots))
+    return [encoded[slot] for slot in positions]
+
+
+def _encode(texts: List[str]) -> NDArray[np.float32]:
+    # Rows of the float32 matrix go to the engine as-is, rather than as
+    # boxed Python floats per chunk
+    return get_embedder().encode(
+        texts,
+        batch_size=64,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+    )
+
+
+def embedding_column_options(
+    field_name: str = "embedding",
+) -> Optional[Dict[str, PostgresColumnOptions]]:
+    """
+    Postgres column overrides to declare on an embedding export.
+
+    CODESITTER_EMBED_STORAGE=halfvec stores the vectors as pgvector halfvec
+    (16-bit floats), halving the table and HNSW index size. Switching an
+    existing index needs a `cocoindex setup` to recreate the table.
+    """
+    if os.getenv("CODESITTER_EMBED_STORAGE", "vector").lower() == "halfvec":
+        return {field_name: PostgresColumnOptions(type="halfvec")}
+    return None
+
+
+def embedding_vector_indexes(field_name: str = "embedding") -> List[VectorIndexDef]:
+    """
+    Vector indexes to declare on an embedding export.
+
+    With CODESITTER_DEFER_VECTOR_INDEX=true nothing is declared, so a bulk load
+    does not maintain the HNSW graph row by row; `codesitter index
+    --defer-vector-index` builds the index once the load has finished.
+    """
+    if os.getenv("CODESITTER_DEFER_VECTOR_INDEX", "false").lower() == "true":
+        return []
+    return [VectorIndexDef(field_name, VectorSimilarityMetric.COSINE_SIMILARITY)]
+
+
+class DedupedSentenceTransformerEmbed(SentenceTransformerEmbed):
+    """SentenceTransformerEmbed that encodes each distinct text in a batch once (see embed_distinct)."""
+
+
+@op.executor_class(
+    gpu=True,
+    cache=True,
+    batching=True,
+    max_batch_size=512,
+    behavior_version=3,
+    arg_relationship=(op.ArgRelationship.EMBEDDING_ORIGIN_TEXT, "text"),
+)
+class DedupedSentenceTransformerEmbedExecutor(SentenceTransformerEmbedExecutor):
+    """Executor for DedupedSentenceTransformerEmbed."""
+
+    spec: DedupedSentenceTransformerEmbed
+
+    def analyze(self) -> type:
+        limit_cpu_threads()
+        result = super().analyze()
+        quantize_model(self._model)
+        return result
+
+    def __call__(self, text: list[str]) -> list[NDArray[np.float32]]:
+        return embed_distinct(text, super().__call__)
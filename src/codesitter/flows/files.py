@@ -0,0 +1,21 @@
+"""
+Source File Filters
+
+Directories every flow skips. cocoindex's LocalFile source applies
+excluded_patterns while it walks the tree, so pruned directories are never
+listed or read.
+"""
+
+# Build output, dependencies, VCS metadata and caches
+EXCLUDED_DIRS = frozenset({
+    "node_modules", "cdk.out", "dist", "build", ".git",
+    ".venv", "venv", "__pycache__", ".pytest_cache",
+})
+
+# "**/name" matches the directory itself, so the walker skips it without
+# descending; "**/name/**" still covers every path beneath it
+EXCLUDED_PATTERNS = [
+    pattern
+    for name in sorted(EXCLUDED_DIRS)
+    for pattern in (f"**/{name}", f"**/{name}/**")
+]
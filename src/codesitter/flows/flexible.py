@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 from typing import List, Any, Literal
 
+import numpy as np
+
 from cocoindex import (
     FlowBuilder,
     sources,
@@ -14,24 +16,42 @@ from cocoindex import (
     VectorIndexDef,
     VectorSimilarityMetric,
     Vector,  # Import Vector type
+    Json,
 )
 from cocoindex.targets import Postgres
 from cocoindex.op import TargetSpec, target_connector
 
-from sentence_transformers import SentenceTransformer
 import logging
 
 from codesitter.analyzers import (
     get_registry,
-    auto_discover_analyzers,
-    register_defaults,
+    ensure_initialized,
     get_analyzer,
+    file_extension,
 )
+from codesitter.flows.files import EXCLUDED_PATTERNS
+from codesitter.flows.embedding import embed_distinct, embedding_column_options
+from codesitter.flows.parallel import analyze_custom_metadata, run_analysis
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install codesitter[fast]
+    orjson = None
 
 # ————————————————————————————————————————————————————————————————————————————————
 # Custom JSON‑file target (since there's no built‑in JsonFile in cocoindex.targets)
 # ————————————————————————————————————————————————————————————————————————————————
 
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback for the values orjson serializes natively, e.g. embeddings."""
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+def _dump_row(value: Any) -> bytes:
+    """Serialize one row, using orjson (numpy-aware) when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=_json_default).encode()
+
 class JsonFileTarget(TargetSpec):
     """Write all collected rows out as a single JSON array."""
     path: str
@@ -55,13 +75,23 @@ class JsonFileTargetConnector:
 
     @staticmethod
     def mutate(*all_mutations: tuple[JsonFileTarget, dict[Any, Any]]) -> None:
-        # Gather every row’s value dict, then dump as one JSON array
-        rows: List[Any] = []
-        for spec, batch in all_mutations:
-            rows.extend(batch.values())
-        open_mode = "w" if spec.mode == "overwrite" else "a"
+        # Stream every row’s value dict into one JSON array, a batch at a time,
+        # instead of building the whole list and its JSON text in memory
+        if not all_mutations:
+            return
+        spec = all_mutations[-1][0]
+        open_mode = "wb" if spec.mode == "overwrite" else "ab"
         with open(spec.path, open_mode) as f:
-            json.dump(rows, f)
+            f.write(b"[")
+            first = True
+            for _, batch in all_mutations:
+                if not batch:
+                    continue
+                if not first:
+                    f.write(b",")
+                f.write(b",".join(_dump_row(value) for value in batch.values()))
+                first = False
+            f.write(b"]")
 
 # ————————————————————————————————————————————————————————————————————————————————
 # End custom target
@@ -72,48 +102,48 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize analyzer registry
-logger.info("Initializing language analyzers...")
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # Log supported extensions
 registry = get_registry()
 supported_exts = registry.list_supported_extensions()
 logger.info(f"Registered language support for: {list(supported_exts.keys())}")
 
-# Embedding model
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
-
-@op.function()
-def extract_extension(filename: str) -> str:
-    return os.path.splitext(filename)[1].lower()
+# Languages for extensions with no registered analyzer
+FALLBACK_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".cs": "csharp",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+}
 
 @op.function()
 def get_language(filename: str) -> str:
     analyzer = get_analyzer(filename)
     if analyzer:
         return analyzer.language_name
-    ext = extract_extension(filename)
-    return {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".c": "c",
-        ".cs": "csharp",
-        ".go": "go",
-        ".rs": "rust",
-        ".rb": "ruby",
-        ".php": "php",
-    }.get(ext, "text")
-
-@op.function()
-def embed(text: str) -> Vector[float, Literal[384]]:
-    if not text:
-        # Return zero vector with correct dimension
-        return [0.0] * 384
-    return embedder.encode(text.strip()).tolist()
+    return FALLBACK_LANGUAGES.get(file_extension(filename), "text")
+
+@op.function(cache=True, batching=True, behavior_version=2)
+def embed(texts: List[str]) -> List[Vector[np.float32, Literal[384]]]:
+    """Embed a batch of chunk texts in one encode() call, each distinct text once."""
+    return embed_distinct(texts)
+
+@op.function(cache=True, behavior_version=1)
+async def extract_custom_metadata(chunk_text: str, filename: str, language: str) -> Json:
+    """Analyzer custom metadata for a chunk, parsed in the analyzer process pool."""
+    try:
+        return await run_analysis(analyze_custom_metadata, chunk_text, filename, language)
+    except Exception as e:
+        logger.error(f"Error extracting metadata from {filename}: {e}")
+        return {}
 
 @flow_def(name="FlexibleCodeIndex")
 def flexible_code_index_flow(flow_builder: FlowBuilder, data_scope: DataScope):
@@ -123,7 +153,7 @@ def flexible_code_index_flow(flow_builder: FlowBuilder, data_scope: DataScope):
         sources.LocalFile(
             path=".",
             included_patterns=patterns,
-            excluded_patterns=["**/node_modules/**", "**/dist/**", "**/build/**", "**/.git/**"],
+            excluded_patterns=EXCLUDED_PATTERNS,
         )
     )
     data_scope["files"] = files
@@ -133,7 +163,6 @@ def flexible_code_index_flow(flow_builder: FlowBuilder, data_scope: DataScope):
 
     # 3. Process each file → chunks → embeddings
     with files.row() as file:
-        file["ext"] = file["filename"].transform(extract_extension)
         file["language"] = file["filename"].transform(get_language)
 
         file["chunks"] = file["content"].transform(
@@ -146,27 +175,14 @@ def flexible_code_index_flow(flow_builder: FlowBuilder, data_scope: DataScope):
         with file["chunks"].row() as chunk:
             chunk["embedding"] = chunk["text"].transform(embed)
 
-            # Create CodeChunk object for analyzer
-            from codesitter.analyzers.base import CodeChunk
-            chunk_obj = CodeChunk(
-                text=chunk["text"].get(),
-                filename=file["filename"].get(),
-                start_line=chunk["location"].get()[0] if hasattr(chunk["location"], 'get') else 0,
-                end_line=chunk["location"].get()[1] if hasattr(chunk["location"], 'get') else 0,
-                node_type="",  # Would need Tree-sitter node type
-                symbols=[]
+            # Analyzer metadata per chunk, parsed off the event loop
+            chunk["custom_metadata"] = chunk["text"].transform(
+                extract_custom_metadata,
+                filename=file["filename"],
+                language=file["language"],
             )
 
-            # Get analyzer and extract relationships
-            analyzer = get_analyzer(file["filename"].get())
-            custom_metadata = {}
-            if analyzer and analyzer.language_name != "default":
-                # Extract custom metadata
-                custom_metadata = analyzer.extract_custom_metadata(chunk_obj)
-
-                # TODO: Add separate collectors for relationships
-                # calls = list(analyzer.extract_call_relationships(chunk_obj))
-                # imports = list(analyzer.extract_import_relationships(chunk_obj))
+            # TODO: Add separate collectors for call and import relationships
 
             collector.collect(
                 filename=file["filename"],
@@ -174,14 +190,14 @@ def flexible_code_index_flow(flow_builder: FlowBuilder, data_scope: DataScope):
                 chunk_text=chunk["text"],
                 embedding=chunk["embedding"],
                 language=file["language"],
-                custom_metadata=custom_metadata,  # Add this field
+                custom_metadata=chunk["custom_metadata"],
             )
 
     # 4. Export to Postgres or JSON file
     if os.getenv("USE_POSTGRES", "false").lower() == "true":
         collector.export(
             "code_chunks",
-            Postgres(),
+            Postgres(column_options=embedding_column_options()),
             primary_key_fields=["filename", "location"],
             vector_indexes=[VectorIndexDef("embedding", VectorSimilarityMetric.COSINE_SIMILARITY)],
         )
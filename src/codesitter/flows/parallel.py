@@ -0,0 +1,160 @@
+"""
+Analyzer Process Pool
+
+Runs per-chunk analyzer work and per-file smart chunking in worker processes
+so tree-sitter parsing of different chunks and files is not serialized on the
+GIL. cocoindex awaits async ops
+directly and keeps many rows in flight, so an async op that hands its work to
+this pool gets chunk-level parallelism.
+
+The analysis functions take the file's language (resolved once per file row)
+rather than resolving an analyzer from the filename for every chunk.
+
+Set CODESITTER_ANALYZER_WORKERS to the number of worker processes, or "auto"
+for one per CPU. 0 (the default) or 1 runs the analyzers in a thread, as a
+plain sync op would.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from codesitter.analyzers import ensure_initialized, get_registry
+from codesitter.analyzers.base import CodeChunk
+from codesitter.chunkers import SmartChunker
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_count() -> int:
+    value = os.getenv("CODESITTER_ANALYZER_WORKERS", "0").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning(f"Invalid CODESITTER_ANALYZER_WORKERS={value!r}; running analyzers in a thread")
+        return 0
+
+
+ANALYZER_WORKERS = _worker_count()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_smart_chunker: Optional[SmartChunker] = None
+
+ensure_initialized()
+
+
+def _init_worker() -> None:
+    """Populate the analyzer registry in a worker; a no-op if it was inherited."""
+    ensure_initialized()
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for the worker pool.
+
+    The parent is running cocoindex's engine threads, so it must not fork.
+    Where available, a forkserver is started clean, imports this module (which
+    populates the registry) once, and forks every worker from there; otherwise
+    each worker is spawned and initializes its own registry.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=ANALYZER_WORKERS,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+        )
+    return _pool
+
+
+def _make_chunk(text: str, filename: str) -> CodeChunk:
+    return CodeChunk(
+        text=text,
+        filename=filename,
+        start_line=0,
+        end_line=0,
+        node_type="",
+        symbols=[]
+    )
+
+
+def analyze_custom_metadata(text: str, filename: str, language: str) -> Dict[str, Any]:
+    """Analyzer custom metadata for a chunk; empty when no analyzer applies."""
+    analyzer = get_registry().get_analyzer_by_language(language)
+    if not analyzer or analyzer.language_name == "default":
+        return {}
+    return analyzer.extract_custom_metadata(_make_chunk(text, filename)) or {}
+
+
+def analyze_call_relationships(text: str, filename: str, language: str) -> List[Dict[str, Any]]:
+    """Call relationships in a chunk as plain dicts; empty when no analyzer applies."""
+    analyzer = get_registry().get_analyzer_by_language(language)
+    if not analyzer or analyzer.language_name == "default":
+        return []
+    return [
+        {
+            "caller": call.caller,
+            "callee": call.callee,
+            "arguments": call.arguments,
+            "line": call.line,
+            "column": call.column
+        }
+        for call in analyzer.extract_call_relationships(_make_chunk(text, filename))
+    ]
+
+
+def smart_chunk(content: str, path: str) -> List[Dict[str, Any]]:
+    """SmartChunker chunks of a file as CocoIndex rows."""
+    global _smart_chunker
+    if _smart_chunker is None:
+        _smart_chunker = SmartChunker()
+
+    return [
+        {
+            "text": chunk.text,
+            "chunk_index": i,
+            "chunk_type": chunk.chunk_type.value,
+            "chunk_id": chunk.chunk_id,
+            "content_hash": chunk.content_hash,
+            "metadata": chunk.metadata,
+            "file_path": chunk.file_path,
+            "file_imports": chunk.file_imports,
+            "file_exports": chunk.file_exports,
+            "start_line": chunk.start_line,
+            "end_line": chunk.end_line,
+            "dependencies": chunk.dependencies or [],
+            "dependents": chunk.dependents or []
+        }
+        for i, chunk in enumerate(_smart_chunker.chunk_file(path, content))
+    ]
+
+
+async def run_analysis(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run ``fn(*args)`` off the event loop.
+
+    Args:
+        fn: A module-level function from this module (it must be picklable)
+        *args: Its arguments, typically (text, filename, language)
+
+    Returns:
+        Whatever ``fn`` returns
+    """
+    if ANALYZER_WORKERS <= 1:
+        return await asyncio.to_thread(fn, *args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), fn, *args)
@@ -8,11 +8,15 @@ This flow:
 4. Preserves all relationships and imports
 """
 
+import hashlib
 import os
 from typing import List, Dict, Any
 from pathlib import Path
 import logging
 
+import numpy as np
+from numpy.typing import NDArray
+
 from cocoindex import (
     FlowBuilder,
     sources,
@@ -22,21 +26,15 @@ from cocoindex import (
     transform_flow,
 )
 
-from sentence_transformers import SentenceTransformer
-
-from codesitter.chunkers import SmartChunker, ChunkResult
+from codesitter.chunkers import ChunkResult
+from codesitter.flows.files import EXCLUDED_PATTERNS
+from codesitter.flows.embedding import embed_distinct, embedding_column_options
+from codesitter.flows.parallel import run_analysis, smart_chunk
 
 logger = logging.getLogger(__name__)
 
-# Initialize the smart chunker
-smart_chunker = SmartChunker()
-
-# Initialize embedder
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
-
-
 @op
-def smart_chunk_file(content: str, path: str) -> List[Dict[str, Any]]:
+async def smart_chunk_file(content: str, path: str) -> List[Dict[str, Any]]:
     """
     Use our smart chunker to create intelligent chunks.
 
@@ -45,28 +43,9 @@ def smart_chunk_file(content: str, path: str) -> List[Dict[str, Any]]:
     logger.info(f"Smart chunking file: {path}")
 
     try:
-        # Get smart chunks
-        chunk_results = smart_chunker.chunk_file(path, content)
-
-        # Convert to CocoIndex format
-        chunks = []
-        for i, chunk_result in enumerate(chunk_results):
-            chunk_dict = {
-                "text": chunk_result.text,
-                "chunk_index": i,
-                "chunk_type": chunk_result.chunk_type.value,
-                "chunk_id": chunk_result.chunk_id,
-                "content_hash": chunk_result.content_hash,
-                "metadata": chunk_result.metadata,
-                "file_path": chunk_result.file_path,
-                "file_imports": chunk_result.file_imports,
-                "file_exports": chunk_result.file_exports,
-                "start_line": chunk_result.start_line,
-                "end_line": chunk_result.end_line,
-                "dependencies": chunk_result.dependencies or [],
-                "dependents": chunk_result.dependents or []
-            }
-            chunks.append(chunk_dict)
+        # Chunked in the analyzer process pool when CODESITTER_ANALYZER_WORKERS > 1,
+        # so files are parsed in parallel rather than one at a time
+        chunks = await run_analysis(smart_chunk, content, path)
 
         logger.info(f"Created {len(chunks)} smart chunks for {path}")
         return chunks
@@ -79,22 +58,24 @@ def smart_chunk_file(content: str, path: str) -> List[Dict[str, Any]]:
             "chunk_index": 0,
             "chunk_type": "file_context",
             "chunk_id": f"{path}:full",
-            "content_hash": str(hash(content)),
+            "content_hash": hashlib.md5(content.encode()).hexdigest(),
             "metadata": {"error": str(e)},
             "file_path": path,
             "file_imports": [],
             "file_exports": [],
             "start_line": 1,
-            "end_line": len(content.split('\n')),
+            "end_line": content.count('\n') + 1,
             "dependencies": [],
             "dependents": []
         }]
 
 
-@op
-def create_embedding(text: str) -> List[float]:
-    """Create embeddings for semantic search."""
-    return embedder.encode(text).tolist()
+# Cached by cocoindex on the chunk text, so a re-index only embeds chunks whose
+# content changed; bump behavior_version when EMBED_MODEL changes
+@op.function(cache=True, batching=True, behavior_version=3)
+def create_embeddings(texts: List[str]) -> List[NDArray[np.float32]]:
+    """Create embeddings for semantic search, one encode() call per batch of chunks."""
+    return embed_distinct(texts)
 
 
 # Build the flow
@@ -134,13 +115,7 @@ files = flow.add_source(
             "*.zig",                            # Zig
         ],
         excluded_patterns=[
-            "**/node_modules/**",
-            "**/.git/**",
-            "**/dist/**",
-            "**/build/**",
-            "**/__pycache__/**",
-            "**/.venv/**",
-            "**/venv/**",
+            *EXCLUDED_PATTERNS,
             "**/*.min.js",
             "**/*.min.css",
         ],
@@ -154,7 +129,7 @@ chunks = files["content"].transform(
 ).explode()
 
 # Add embeddings for semantic search
-chunks["embedding"] = chunks["text"].transform(create_embedding)
+chunks["embedding"] = chunks["text"].transform(create_embeddings)
 
 # Select columns for output
 output = chunks.select(
@@ -174,6 +149,12 @@ output = chunks.select(
     dependents=chunks["dependents"]
 )
 
+def embedding_column_type() -> str:
+    """pgvector column type for embeddings: halfvec with CODESITTER_EMBED_STORAGE=halfvec."""
+    options = embedding_column_options()
+    return options["embedding"].type if options else "vector"
+
+
 # Storage configuration
 if os.getenv("USE_POSTGRES", "false").lower() == "true":
     from cocoindex.sinks import Postgres
@@ -192,7 +173,7 @@ if os.getenv("USE_POSTGRES", "false").lower() == "true":
                 "chunk_id": "TEXT PRIMARY KEY",
                 "content_hash": "TEXT",
                 "text": "TEXT",
-                "embedding": f"vector(384)",
+                "embedding": f"{embedding_column_type()}(384)",
                 "metadata": "JSONB",
                 "file_imports": "JSONB",
                 "file_exports": "JSONB",
@@ -11,7 +11,6 @@ from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import psycopg2
 from pgvector.psycopg2 import register_vector
 import logging
@@ -40,12 +39,21 @@ class CodeSearchEngine:
         self.json_index_path = json_index_path
         self.symbol_index_path = symbol_index_path
 
-        # Initialize embedding model for semantic search
-        self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
+        # Embedding model for semantic search, loaded on first use
+        self._embedder = None
 
         # Load indices
         self._load_indices()
 
+    @property
+    def embedder(self):
+        """The query embedding model; symbol and call-site searches never load it."""
+        if self._embedder is None:
+            # Same model, backend and dtype as the index, so query vectors match
+            from codesitter.flows.embedding import get_embedder
+            self._embedder = get_embedder()
+        return self._embedder
+
     def _load_indices(self):
         """Load symbol index and connect to database if available."""
         # Load symbol index
@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
 """Test the analyze command with calls in function metadata."""
 
-import subprocess
 import json
 import sys
 
-# Run the codesitter analyze command
-result = subprocess.run(
-    ["python", "-m", "codesitter", "analyze", "file", "test_calls.ts", "--json"],
-    capture_output=True,
-    text=True
-)
+from click.testing import CliRunner
 
-if result.returncode != 0:
-    print(f"Error running command: {result.stderr}")
+from codesitter.cli import cli
+
+# Run the codesitter analyze command in-process
+result = CliRunner().invoke(cli, ["analyze", "file", "test_calls.ts", "--json"])
+
+if result.exit_code != 0:
+    print(f"Error running command: {result.output}")
     sys.exit(1)
 
 # Parse the JSON output
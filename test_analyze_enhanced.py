@@ -1,19 +1,17 @@
 #!/usr/bin/env python3
 
-import subprocess
 import json
 import sys
 
-# Run the analyze command
-result = subprocess.run(
-    ["python", "-m", "codesitter", "analyze", "file", "test_calls_enhanced.ts", "--json"],
-    capture_output=True,
-    text=True,
-    cwd="/Users/mustafaacar/codesitter"
-)
+from click.testing import CliRunner
 
-if result.returncode != 0:
-    print(f"Error: {result.stderr}")
+from codesitter.cli import cli
+
+# Run the analyze command in-process
+result = CliRunner().invoke(cli, ["analyze", "file", "test_calls_enhanced.ts", "--json"])
+
+if result.exit_code != 0:
+    print(f"Error: {result.output}")
     sys.exit(1)
 
 # Parse and display the JSON output
@@ -2,22 +2,19 @@
 """Test the updated analyze command with line content."""
 
 import json
-import subprocess
-import sys
+
+from click.testing import CliRunner
+
+from codesitter.cli import cli
 
 def test_analyze_with_line_content():
     """Run analyze command and display the output."""
     try:
-        # Run the analyze command
-        result = subprocess.run(
-            [sys.executable, "-m", "codesitter", "analyze", "file", "test_calls.ts", "--json"],
-            capture_output=True,
-            text=True,
-            cwd="/Users/mustafaacar/codesitter"
-        )
-
-        if result.returncode != 0:
-            print(f"Error: {result.stderr}")
+        # Run the analyze command in-process
+        result = CliRunner().invoke(cli, ["analyze", "file", "test_calls.ts", "--json"])
+
+        if result.exit_code != 0:
+            print(f"Error: {result.output}")
             return
 
         # Parse and pretty-print the JSON
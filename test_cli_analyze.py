@@ -1,33 +1,28 @@
 #!/usr/bin/env python3
 """Test CLI analyze command with structure."""
 
-import subprocess
-import sys
+from click.testing import CliRunner
+
+from codesitter.cli import cli
+
+runner = CliRunner()
 
 # Run the analyze command
 print("Running: codesitter analyze file test_structure.ts")
 print("=" * 80)
 
-result = subprocess.run(
-    [sys.executable, "-m", "codesitter", "analyze", "file", "test_structure.ts"],
-    capture_output=True,
-    text=True
-)
+result = runner.invoke(cli, ["analyze", "file", "test_structure.ts"])
 
-print(result.stdout)
-if result.stderr:
-    print("STDERR:", result.stderr)
+print(result.output)
+if result.exception:
+    print("ERROR:", result.exception)
 
 print("\n" + "=" * 80)
 print("Running with --json flag:")
 print("=" * 80)
 
-result = subprocess.run(
-    [sys.executable, "-m", "codesitter", "analyze", "file", "test_structure.ts", "--json"],
-    capture_output=True,
-    text=True
-)
+result = runner.invoke(cli, ["analyze", "file", "test_structure.ts", "--json"])
 
-print(result.stdout)
-if result.stderr:
-    print("STDERR:", result.stderr)
+print(result.output)
+if result.exception:
+    print("ERROR:", result.exception)
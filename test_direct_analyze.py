@@ -1,13 +1,14 @@
 import sys
 sys.path.insert(0, '/Users/mustafaacar/codesitter/src')
 
-from codesitter.cli.commands.analyze import _ensure_initialized, file
+from codesitter.analyzers import ensure_initialized
+from codesitter.cli.commands.analyze import file
 from pathlib import Path
 import json
 import click
 
 # Initialize
-_ensure_initialized()
+ensure_initialized()
 
 # Create a mock context and run the command
 ctx = click.Context(click.Command('file'))
@@ -10,6 +10,30 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from codesitter.analyzers.languages.typescript import TypeScriptAnalyzer
 from codesitter.analyzers.base import CodeChunk
 
+_ELEMENT_ICONS = {
+    'function': '🔧',
+    'class': '🏛️',
+    'interface': '📘',
+    'type': '📐',
+    'enum': '🎯',
+    'variable': '📦'
+}
+_DEFAULT_ICON = '📄'
+
+def _print_elements(header, elements, details=False):
+    """Print one line per element; with details, also class methods and kind."""
+    print(header)
+    for elem in elements:
+        icon = _ELEMENT_ICONS.get(elem.element_type, _DEFAULT_ICON)
+
+        print(f"  {icon} {elem.element_type}: {elem.name}")
+        if not details:
+            continue
+        if elem.element_type == 'class' and elem.children:
+            print(f"     Methods: {[child.name for child in elem.children if child.element_type == 'function']}")
+        if elem.metadata.get('kind'):
+            print(f"     Kind: {elem.metadata['kind']}")
+
 def test_exports_symbols_extraction():
     """Test extraction of exports and symbols from TypeScript file."""
 
@@ -21,12 +45,11 @@ def test_exports_symbols_extraction():
     analyzer = TypeScriptAnalyzer()
 
     # Create chunk for whole file
-    lines = content.split('\n')
     chunk = CodeChunk(
         text=content,
         filename=str(test_file),
         start_line=1,
-        end_line=len(lines),
+        end_line=content.count('\n') + 1,
         node_type="file",
         symbols=[]
     )
@@ -41,45 +64,41 @@ def test_exports_symbols_extraction():
 
     elements = list(analyzer.extract_structure(chunk))
 
-    # Group by export status
+    # Group by export status, classify exports and find UserService in one pass
     exported_elements = []
     private_elements = []
+    user_service = None
+    export_patterns = {
+        'default': False,
+        'named_values': [],
+        'named_types': [],
+        'interfaces': [],
+        'enums': [],
+        're_exports': []
+    }
+    named_exports = {
+        'variable': export_patterns['named_values'],
+        'type': export_patterns['named_types'],
+        'interface': export_patterns['interfaces'],
+        'enum': export_patterns['enums'],
+    }
 
     for elem in elements:
-        if elem.metadata.get('exported'):
-            exported_elements.append(elem)
-        else:
-            private_elements.append(elem)
-
-    print(f"\n✅ EXPORTED SYMBOLS ({len(exported_elements)}):")
-    for elem in exported_elements:
-        icon = {
-            'function': '🔧',
-            'class': '🏛️',
-            'interface': '📘',
-            'type': '📐',
-            'enum': '🎯',
-            'variable': '📦'
-        }.get(elem.element_type, '📄')
+        if elem.name == "UserService" and user_service is None:
+            user_service = elem
 
-        print(f"  {icon} {elem.element_type}: {elem.name}")
-        if elem.element_type == 'class' and elem.children:
-            print(f"     Methods: {[child.name for child in elem.children if child.element_type == 'function']}")
-        if elem.metadata.get('kind'):
-            print(f"     Kind: {elem.metadata['kind']}")
+        if not elem.metadata.get('exported'):
+            private_elements.append(elem)
+            continue
 
-    print(f"\n🔒 PRIVATE SYMBOLS ({len(private_elements)}):")
-    for elem in private_elements:
-        icon = {
-            'function': '🔧',
-            'class': '🏛️',
-            'interface': '📘',
-            'type': '📐',
-            'enum': '🎯',
-            'variable': '📦'
-        }.get(elem.element_type, '📄')
+        exported_elements.append(elem)
+        if elem.element_type == 'class' and elem.metadata.get('default_export'):
+            export_patterns['default'] = elem.name
+        elif elem.element_type in named_exports:
+            named_exports[elem.element_type].append(elem.name)
 
-        print(f"  {icon} {elem.element_type}: {elem.name}")
+    _print_elements(f"\n✅ EXPORTED SYMBOLS ({len(exported_elements)}):", exported_elements, details=True)
+    _print_elements(f"\n🔒 PRIVATE SYMBOLS ({len(private_elements)}):", private_elements)
 
     # 2. Extract import relationships
     print("\n\n📦 IMPORT/EXPORT STATEMENTS:")
@@ -96,7 +115,6 @@ def test_exports_symbols_extraction():
     print("-" * 40)
 
     # Show details for UserService class
-    user_service = next((e for e in elements if e.name == "UserService"), None)
     if user_service:
         print(f"\nClass: {user_service.name}")
         print(f"  Exported: {user_service.metadata.get('exported', False)}")
@@ -117,27 +135,6 @@ def test_exports_symbols_extraction():
     print("\n\n📤 EXPORT PATTERNS FOUND:")
     print("-" * 40)
 
-    export_patterns = {
-        'default': False,
-        'named_values': [],
-        'named_types': [],
-        'interfaces': [],
-        'enums': [],
-        're_exports': []
-    }
-
-    for elem in exported_elements:
-        if elem.element_type == 'class' and 'default' in chunk.text[elem.start_byte-20:elem.start_byte]:
-            export_patterns['default'] = elem.name
-        elif elem.element_type == 'variable':
-            export_patterns['named_values'].append(elem.name)
-        elif elem.element_type == 'type':
-            export_patterns['named_types'].append(elem.name)
-        elif elem.element_type == 'interface':
-            export_patterns['interfaces'].append(elem.name)
-        elif elem.element_type == 'enum':
-            export_patterns['enums'].append(elem.name)
-
     print(f"  Default export: {export_patterns['default']}")
     print(f"  Named value exports: {export_patterns['named_values']}")
     print(f"  Type exports: {export_patterns['named_types']}")
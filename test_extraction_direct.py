@@ -70,17 +70,24 @@ print(f"  class_declaration maps to: {ts_extractor._node_type_to_element.get('cl
 print("\n\nTEST 3: Direct AST inspection")
 print("=" * 60)
 
-def print_ast(node, indent=0):
-    if node.is_named and node.type in ['interface_declaration', 'class_declaration', 'method_definition']:
-        name = "?"
-        for child in node.children:
-            if child.type in ['identifier', 'type_identifier', 'property_identifier']:
-                name = child.text.decode('utf-8')
-                break
-        print(f"{'  ' * indent}{node.type}: {name}")
-
-    for child in node.children:
-        print_ast(child, indent + 1)
+AST_TARGET_TYPES = frozenset({'interface_declaration', 'class_declaration', 'method_definition'})
+AST_NAME_TYPES = frozenset({'identifier', 'type_identifier', 'property_identifier'})
+
+def print_ast(root):
+    # Depth-first with an explicit stack; children are pushed reversed so
+    # they are visited in source order
+    stack = [(root, 0)]
+    while stack:
+        node, indent = stack.pop()
+        children = node.children
+        if node.is_named and node.type in AST_TARGET_TYPES:
+            name = next(
+                (child.text.decode('utf-8') for child in children if child.type in AST_NAME_TYPES),
+                "?"
+            )
+            print(f"{'  ' * indent}{node.type}: {name}")
+
+        stack.extend((child, indent + 1) for child in reversed(children))
 
 print_ast(tree.root_node)
 
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """Simple test script to demonstrate the enhanced analyze functionality."""
 
-import subprocess
 import json
 
+from click.testing import CliRunner
+
+from codesitter.cli import cli
+
 # First, create the simple test file from the user's example
 test_content = '''const users = [
   { id: 1, name: "John" },
@@ -26,15 +29,11 @@ function getUser(id: number) {
 with open('test_calls.ts', 'w') as f:
     f.write(test_content)
 
-# Run the analyze command
-result = subprocess.run(
-    ["python", "-m", "codesitter", "analyze", "file", "test_calls.ts", "--json"],
-    capture_output=True,
-    text=True
-)
+# Run the analyze command in-process
+result = CliRunner().invoke(cli, ["analyze", "file", "test_calls.ts", "--json"])
 
-if result.returncode == 0:
+if result.exit_code == 0:
     data = json.loads(result.stdout)
     print(json.dumps(data, indent=2))
 else:
-    print(f"Error: {result.stderr}")
+    print(f"Error: {result.output}")
@@ -5,12 +5,11 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from codesitter.analyzers import register_defaults, auto_discover_analyzers, get_analyzer
+from codesitter.analyzers import ensure_initialized, get_analyzer
 from codesitter.analyzers.base import CodeChunk
 
 # Initialize analyzers
-register_defaults()
-auto_discover_analyzers()
+ensure_initialized()
 
 # Test code
 test_code = '''
@@ -43,7 +42,7 @@ chunk = CodeChunk(
     text=test_code,
     filename="test.ts",
     start_line=1,
-    end_line=len(test_code.split('\n')),
+    end_line=test_code.count('\n') + 1,
     node_type="file",
     symbols=[]
 )
@@ -30,7 +30,7 @@ chunk = CodeChunk(
     text=content,
     filename=str(test_file),
     start_line=1,
-    end_line=len(content.split('\n')),
+    end_line=content.count('\n') + 1,
     node_type="file",
     symbols=[],
     metadata={}
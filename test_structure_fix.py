@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
 """Test the fixed structure extraction."""
 
-import subprocess
 import json
 import sys
 
-# Run the analyze command
-result = subprocess.run(
-    [sys.executable, "-m", "codesitter", "analyze", "file", "test_calls.ts", "--json"],
-    capture_output=True,
-    text=True
-)
+from click.testing import CliRunner
 
-if result.returncode != 0:
-    print(f"Error: {result.stderr}")
+from codesitter.cli import cli
+
+# Run the analyze command in-process
+result = CliRunner().invoke(cli, ["analyze", "file", "test_calls.ts", "--json"])
+
+if result.exit_code != 0:
+    print(f"Error: {result.output}")
     sys.exit(1)
 
 data = json.loads(result.stdout)
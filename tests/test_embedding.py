@@ -0,0 +1,34 @@
+"""Tests for the shared embedding helpers."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cocoindex")
+
+from codesitter.flows.embedding import embed_distinct  # noqa: E402
+
+
+def _fake_encode(calls):
+    def encode(texts):
+        calls.append(texts)
+        return np.arange(len(texts) * 2, dtype=np.float32).reshape(-1, 2) + 1
+
+    return encode
+
+
+def test_embed_distinct_encodes_each_stripped_text_once():
+    calls = []
+    rows = embed_distinct(["a", " a\n", "b", "a"], _fake_encode(calls))
+
+    assert calls == [["a", "b"]]
+    assert [row.tolist() for row in rows] == [[1, 2], [1, 2], [3, 4], [1, 2]]
+
+
+@pytest.mark.parametrize("blank", ["", "   "])
+def test_embed_distinct_encodes_blank_text(blank):
+    calls = []
+    rows = embed_distinct([blank, "a"], _fake_encode(calls))
+
+    assert calls == [["", "a"]]
+    assert rows[0].tolist() == [1, 2]
+    assert np.any(rows[0])
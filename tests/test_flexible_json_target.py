@@ -0,0 +1,23 @@
+"""Tests for the flexible flow's JSON file target serialization."""
+
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cocoindex")
+
+from codesitter.flows import flexible  # noqa: E402
+
+
+def test_dump_row_without_orjson_serializes_embeddings(monkeypatch):
+    monkeypatch.setattr(flexible, "orjson", None)
+    row = {
+        "filename": "a.py",
+        "embedding": np.array([0.5, -1.0], dtype=np.float32),
+    }
+
+    assert json.loads(flexible._dump_row(row)) == {
+        "filename": "a.py",
+        "embedding": [0.5, -1.0],
+    }
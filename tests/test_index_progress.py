@@ -0,0 +1,19 @@
+"""Tests for the verbose index progress helpers."""
+
+import pytest
+
+from codesitter.cli.commands.index import _progress_filename
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("Processing file /repo/src/app.tsx", "app.tsx"),
+        ("file /usr/lib/python3.11/site-packages/x/y.py done", "y.py"),
+        ("file /a.b/c/x/y.py", "y.py"),
+        ("file /a.b/c.d.py", "c.d.py"),
+        ("file /repo/README", "unknown"),
+    ],
+)
+def test_progress_filename(line, expected):
+    assert _progress_filename(line) == expected
@@ -0,0 +1,41 @@
+"""Tests for building the vector index after a deferred load."""
+
+import subprocess
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from codesitter.cli.commands import index as index_command
+
+
+def _run_setup(monkeypatch, returncode):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append((cmd, kwargs))
+        return subprocess.CompletedProcess(cmd, returncode, stderr="boom")
+
+    monkeypatch.setattr(index_command.subprocess, "run", fake_run)
+    monkeypatch.setenv("CODESITTER_DEFER_VECTOR_INDEX", "true")
+    monkeypatch.setenv("COCOINDEX_DATABASE_URL", "postgresql://localhost/db")
+    index_command.build_vector_index(Path("flow.py"), Path("."))
+    return calls
+
+
+def test_build_vector_index_runs_cocoindex_setup_with_index_declared(monkeypatch):
+    [(cmd, kwargs)] = _run_setup(monkeypatch, 0)
+
+    assert cmd == ["cocoindex", "setup", "--force", "flow.py"]
+    assert "CODESITTER_DEFER_VECTOR_INDEX" not in kwargs["env"]
+    url = kwargs["env"]["COCOINDEX_DATABASE_URL"]
+    assert parse_qs(urlsplit(url).query)["options"] == [
+        "-c maintenance_work_mem=2GB -c max_parallel_maintenance_workers=4"
+    ]
+
+
+def test_build_vector_index_exits_nonzero_on_failure(monkeypatch):
+    with pytest.raises(SystemExit) as exc_info:
+        _run_setup(monkeypatch, 1)
+
+    assert exc_info.value.code == 1
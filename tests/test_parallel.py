@@ -0,0 +1,24 @@
+"""Tests for the analyzer process pool settings."""
+
+import pytest
+
+from codesitter.flows import parallel
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("3", 3), ("-2", 0), ("four", 0)],
+)
+def test_worker_count(monkeypatch, value, expected):
+    monkeypatch.setenv("CODESITTER_ANALYZER_WORKERS", value)
+    assert parallel._worker_count() == expected
+
+
+def test_worker_count_defaults_to_thread(monkeypatch):
+    monkeypatch.delenv("CODESITTER_ANALYZER_WORKERS", raising=False)
+    assert parallel._worker_count() == 0
+
+
+def test_worker_count_auto(monkeypatch):
+    monkeypatch.setenv("CODESITTER_ANALYZER_WORKERS", "auto")
+    assert parallel._worker_count() >= 1
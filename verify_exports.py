@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
 """Simple script to verify exports extraction is working."""
 
-import subprocess
 import json
 import sys
 
-# Use codesitter analyze directly
-result = subprocess.run(
-    ["python", "-m", "codesitter", "analyze", "file", "test_exports_symbols.ts", "--json"],
-    capture_output=True,
-    text=True
-)
+from click.testing import CliRunner
 
-if result.returncode != 0:
-    print(f"Error: {result.stderr}")
+from codesitter.cli import cli
+
+# Use codesitter analyze directly, in-process
+result = CliRunner().invoke(cli, ["analyze", "file", "test_exports_symbols.ts", "--json"])
+
+if result.exit_code != 0:
+    print(f"Error: {result.output}")
     sys.exit(1)
 
 data = json.loads(result.stdout)
@@ -24,8 +23,10 @@ print("="*80)
 
 # Show structure data
 if 'structure' in data:
-    exported = [e for e in data['structure'] if e.get('metadata', {}).get('exported')]
-    private = [e for e in data['structure'] if not e.get('metadata', {}).get('exported')]
+    # Partition by export status in one pass
+    exported, private = [], []
+    for e in data['structure']:
+        (exported if e.get('metadata', {}).get('exported') else private).append(e)
 
     print(f"\n✅ EXPORTED SYMBOLS: {len(exported)}")
     for elem in exported:
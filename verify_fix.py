@@ -1,23 +1,14 @@
 #!/usr/bin/env python3
 """Verify TypeScript analyzer is now working."""
-import sys
-import os
-os.chdir('/Users/mustafaacar/codesitter')
+from click.testing import CliRunner
 
-# Run the analyze command and capture output
-import subprocess
-result = subprocess.run(
-    [sys.executable, '-m', 'codesitter', 'analyze', 'file', 'test_analyzer.ts'],
-    capture_output=True,
-    text=True
-)
+from codesitter.cli import cli
 
-print("Output:")
-print(result.stdout)
+# Run the analyze command in-process; output includes any error message
+result = CliRunner().invoke(cli, ['analyze', 'file', 'test_analyzer.ts'])
 
-if result.stderr:
-    print("\nErrors:")
-    print(result.stderr)
+print("Output:")
+print(result.output)
 
 # Check if we got meaningful output
 if "Imports" in result.stdout and "Function Calls" in result.stdout:
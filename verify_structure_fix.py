@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
 """Quick verification of the fixes."""
 
-import subprocess
 import json
 import sys
 
-# Run the analyze command
-result = subprocess.run(
-    [sys.executable, "-m", "codesitter", "analyze", "file", "test_calls.ts", "--json"],
-    capture_output=True,
-    text=True
-)
+from click.testing import CliRunner
 
-if result.returncode != 0:
-    print(f"Error: {result.stderr}")
+from codesitter.cli import cli
+
+# Run the analyze command in-process
+result = CliRunner().invoke(cli, ["analyze", "file", "test_calls.ts", "--json"])
+
+if result.exit_code != 0:
+    print(f"Error: {result.output}")
     sys.exit(1)
 
 data = json.loads(result.stdout)
@@ -25,6 +24,11 @@ print("=" * 60)
 structure = data.get('structure', [])
 print(f"Total elements: {len(structure)}")
 
+# First element with each name, for the expected-name lookups below
+by_name = {}
+for elem in structure:
+    by_name.setdefault(elem['name'], elem)
+
 # Expected elements
 expected = {
     'User': 'interface',
@@ -35,7 +39,7 @@ expected = {
 
 print("\nChecking expected elements:")
 for name, expected_type in expected.items():
-    found = next((e for e in structure if e['name'] == name), None)
+    found = by_name.get(name)
     if found:
         actual_type = found['type']
         status = "✓" if actual_type == expected_type else f"⚠ (got {actual_type})"
@@ -55,7 +59,7 @@ for elem in structure:
 
 # Summary
 print("\n" + "-" * 60)
-missing_count = sum(1 for name in expected if not any(e['name'] == name for e in structure))
+missing_count = sum(1 for name in expected if name not in by_name)
 if missing_count == 0:
     print("✅ ALL EXPECTED ELEMENTS FOUND! Structure extraction is working correctly.")
 else: